@@ -2,8 +2,12 @@
 import uuid
 from collections import deque
 
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 
 
 class Node:
@@ -58,37 +62,227 @@ def draw_tree(root, title="Binary Tree"):
     plt.show()
 
 
-def iter_nodes_preorder(root):
-    """Повертає список вузлів у порядку (preorder) без рекурсії: root-left-right."""
-    if root is None:
-        return []
-    out = []
-    stack = [root]
+class TreeView:
+    """
+    Постійне відображення дерева: граф, координати та фігура будуються один раз,
+    а кожен крок обходу лише змінює колір одного вузла в наявній колекції точок.
+    """
+
+    def __init__(self, root, title="Binary Tree"):
+        graph = nx.DiGraph()
+        pos = {root.id: (0, 0)}
+        add_edges(graph, root, pos)
+
+        self.index = {n: i for i, n in enumerate(graph.nodes)}
+        self.fig, self.ax = plt.subplots(figsize=(10, 6))
+        self.ax.set_title(title)
+        self.ax.set_axis_off()
+
+        colors = [graph.nodes[n]["color"] for n in graph.nodes]
+        labels = {n: graph.nodes[n]["label"] for n in graph.nodes}
+        nx.draw_networkx_edges(graph, pos, ax=self.ax, arrows=False, node_size=1800)
+        self.nodes = nx.draw_networkx_nodes(graph, pos, ax=self.ax, node_color=colors, node_size=1800)
+        nx.draw_networkx_labels(graph, pos, labels=labels, ax=self.ax, font_size=12)
+
+        self._rgba = self.nodes.get_facecolors().copy()
+        self._base = self._rgba.copy()
+
+    def set_node_color(self, node, color):
+        self._rgba[self.index[node.id]] = to_rgba(color)
+        self.nodes.set_facecolor(self._rgba)
+
+    def reset(self):
+        self._rgba[:] = self._base
+        self.nodes.set_facecolor(self._rgba)
+
+    def set_title(self, title):
+        self.ax.set_title(title)
+
+    def close(self):
+        plt.close(self.fig)
+
+
+def tree_layout(root):
+    """
+    Розкладка дерева без рекурсії за O(n): x — номер вузла в симетричному (inorder)
+    порядку, y — мінус глибина. Вузли ніколи не накладаються, хоч яке глибоке дерево.
+    Повертає (nodes, x, y, parent): вузли отримують цілі id — індекси в nodes;
+    parent[i] — id батька (-1 для кореня).
+    """
+    nodes, depths, parents = [], [], []
+    stack = []
+    node, depth, parent = root, 0, None
+    ids = {}
+
+    while stack or node is not None:
+        # Спускаємося ліворуч, запамʼятовуючи шлях
+        while node is not None:
+            stack.append((node, depth, parent))
+            node, depth, parent = node.left, depth + 1, node
+        node, depth, parent = stack.pop()
+
+        ids[id(node)] = len(nodes)
+        nodes.append(node)
+        depths.append(depth)
+        parents.append(parent)
+        node, depth, parent = node.right, depth + 1, node
+
+    parent_ids = np.array([ids[id(p)] if p is not None else -1 for p in parents], dtype=np.int64)
+    x = np.arange(len(nodes), dtype=float)
+    y = -np.array(depths, dtype=float)
+    return nodes, x, y, parent_ids
+
+
+def draw_tree_fast(root, title="Binary Tree", label_limit=63):
+    """Малює велике дерево однією LineCollection та одним scatter (без networkx)."""
+    nodes, x, y, parent = tree_layout(root)
+    child = np.nonzero(parent >= 0)[0]
+    segments = np.stack([np.column_stack([x[parent[child]], y[parent[child]]]),
+                         np.column_stack([x[child], y[child]])], axis=1)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.set_title(title)
+    ax.add_collection(LineCollection(segments, colors="gray", linewidths=0.5))
+    ax.scatter(x, y, s=max(1.0, min(900.0, 20000 / max(1, len(nodes)))),
+               c=[node.color for node in nodes], zorder=2)
+
+    if len(nodes) <= label_limit:
+        for node, px, py in zip(nodes, x, y):
+            ax.annotate(str(node.val), (px, py), ha="center", va="center", color="white", zorder=3)
+
+    ax.autoscale_view()
+    ax.set_axis_off()
+    plt.show()
+
+
+# ---------- ЛІНИВІ ОБХОДИ (ГЕНЕРАТОРИ, БЕЗ РЕКУРСІЇ) ----------
+
+def preorder(root):
+    """Генератор вузлів у порядку root-left-right (стек висотою O(h))."""
+    stack = [root] if root is not None else []
     while stack:
         node = stack.pop()
-        out.append(node)
+        yield node
         # важливо: правий штовхаємо першим, щоб лівий обробився раніше
         if node.right:
             stack.append(node.right)
         if node.left:
             stack.append(node.left)
-    return out
 
 
-def iter_nodes_levelorder(root):
-    """Повертає список вузлів у порядку BFS без рекурсії."""
-    if root is None:
-        return []
-    out = []
-    q = deque([root])
+def inorder(root):
+    """Генератор вузлів у порядку left-root-right."""
+    stack = []
+    node = root
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+def postorder(root):
+    """Генератор вузлів у порядку left-right-root (один стек + останній відвіданий вузол)."""
+    stack = []
+    node = root
+    last = None
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        top = stack[-1]
+        if top.right is not None and top.right is not last:
+            node = top.right
+        else:
+            stack.pop()
+            last = top
+            yield top
+
+
+def levelorder(root):
+    """Генератор вузлів у порядку BFS (черга)."""
+    q = deque([root]) if root is not None else deque()
     while q:
         node = q.popleft()
-        out.append(node)
+        yield node
         if node.left:
             q.append(node.left)
         if node.right:
             q.append(node.right)
-    return out
+
+
+def reverse_levelorder(root):
+    """
+    Генератор вузлів від нижнього рівня до кореня, у кожному рівні — зліва направо.
+    Перший вузол відомий лише після проходу всього дерева, тож памʼять O(n).
+    """
+    stack = []
+    q = deque([root]) if root is not None else deque()
+    while q:
+        node = q.popleft()
+        stack.append(node)
+        # правий першим: після розвороту стеку рівень читається зліва направо
+        if node.right:
+            q.append(node.right)
+        if node.left:
+            q.append(node.left)
+    while stack:
+        yield stack.pop()
+
+
+def _morris(root, pre):
+    """
+    Обхід Морріса: O(1) додаткової памʼяті завдяки тимчасовим "ниткам"
+    node.right від попередника до поточного вузла. Дерево відновлюється
+    повністю, навіть якщо генератор закрили до кінця обходу.
+    """
+    current = root
+
+    def step():
+        # Один крок обходу: повертає (вузол для видачі або None, наступний current)
+        node = current
+        if node.left is None:
+            return node, node.right
+        pred = node.left
+        while pred.right is not None and pred.right is not node:
+            pred = pred.right
+        if pred.right is None:
+            pred.right = node  # нитка назад до node
+            return (node if pre else None), node.left
+        pred.right = None  # ліве піддерево пройдено — прибираємо нитку
+        return (None if pre else node), node.right
+
+    try:
+        while current is not None:
+            visit, current = step()
+            if visit is not None:
+                yield visit
+    finally:
+        # Якщо обхід перервано — доходимо до кінця без видачі, щоб прибрати нитки
+        while current is not None:
+            _, current = step()
+
+
+def morris_inorder(root):
+    """Генератор вузлів left-root-right з O(1) додаткової памʼяті (тимчасово змінює right-посилання)."""
+    return _morris(root, pre=False)
+
+
+def morris_preorder(root):
+    """Генератор вузлів root-left-right з O(1) додаткової памʼяті (тимчасово змінює right-посилання)."""
+    return _morris(root, pre=True)
+
+
+def iter_nodes_preorder(root):
+    """Повертає список вузлів у порядку (preorder) без рекурсії: root-left-right."""
+    return list(preorder(root))
+
+
+def iter_nodes_levelorder(root):
+    """Повертає список вузлів у порядку BFS без рекурсії."""
+    return list(levelorder(root))
 
 
 def gradient_hex_colors(n, start=(20, 20, 20), end=(200, 230, 255)):
@@ -113,21 +307,42 @@ def gradient_hex_colors(n, start=(20, 20, 20), end=(200, 230, 255)):
 
 def reset_colors(root, base="#1a1a1a"):
     """Скинути всі кольори вузлів до базового."""
-    for node in iter_nodes_levelorder(root):
+    for node in levelorder(root):
         node.color = base
 
 
-def visualize_traversal_steps(root, order_nodes, traversal_name="Traversal"):
+def visualize_traversal_steps(root, order_nodes, traversal_name="Traversal", save_path=None, interval=0.8):
     """
-    Візуалізує кожен крок обходу.
+    Візуалізує кожен крок обходу в одному вікні (розкладка будується один раз).
     Кожен відвіданий вузол отримує унікальний колір з градієнту.
+    save_path — зберегти весь обхід однією анімацією (.gif або .mp4) замість показу.
+    interval — пауза між кроками, секунди.
     """
     reset_colors(root, base="#1a1a1a")
-
+    view = TreeView(root, title=traversal_name)
     colors = gradient_hex_colors(len(order_nodes))
-    for step, (node, c) in enumerate(zip(order_nodes, colors), start=1):
+
+    def step(i):
+        node, c = order_nodes[i], colors[i]
         node.color = c
-        draw_tree(root, title=f"{traversal_name}: крок {step} (відвідано: {node.val})")
+        view.set_node_color(node, c)
+        view.set_title(f"{traversal_name}: крок {i + 1} (відвідано: {node.val})")
+        return (view.nodes,)
+
+    if save_path:
+        anim = FuncAnimation(view.fig, step, frames=len(order_nodes), interval=interval * 1000,
+                             repeat=False, blit=False)
+        writer = "pillow" if save_path.lower().endswith(".gif") else None
+        anim.save(save_path, writer=writer)  # fps береться з interval анімації
+        view.close()
+        return
+
+    plt.show(block=False)
+    for i in range(len(order_nodes)):
+        step(i)
+        plt.pause(interval)
+    plt.show()
+    view.close()
 
 
 # ---------- Приклад дерева ----------
@@ -1,10 +1,24 @@
 # Monte Carlo
+import argparse
 import random
-from collections import Counter
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from statistics import NormalDist
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Скільки кидків генерувати за один раз (памʼять не залежить від n_rolls)
+CHUNK_SIZE = 1 << 20
+
+# Від якої довжини многочленів згортка рахується через FFT
+FFT_THRESHOLD = 512
+
+# Проміжний результат потокової симуляції
+Snapshot = namedtuple("Snapshot", ["counts", "n_rolls", "max_error"])
+
 
 def simulate_two_dice(n_rolls: int, seed: int = 123) -> Counter:
     """Monte Carlo simulation of rolling two fair dice n_rolls times."""
@@ -16,32 +30,220 @@ def simulate_two_dice(n_rolls: int, seed: int = 123) -> Counter:
     return counts
 
 
-def main():
-    N = 1_000_000  # кількість симуляцій
-    sim_counts = simulate_two_dice(N, seed=123)
-    sim_probs = {s: sim_counts.get(s, 0) / N for s in range(2, 13)}
+def _roll_histogram(rng: np.random.Generator, n_rolls: int, n_dice: int, faces: int,
+                    chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Кидає n_dice кубиків з faces гранями n_rolls разів порціями по chunk_size.
+    Повертає масив hist, де hist[s] — скільки разів випала сума s.
+    """
+    max_sum = n_dice * faces
+    dtype = np.int32 if max_sum < np.iinfo(np.int32).max else np.int64
+    hist = np.zeros(max_sum + 1, dtype=np.int64)
 
-    # Аналітика (кількість способів отримати суму / 36)
-    analytic_counts = {2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 7: 6, 8: 5, 9: 4, 10: 3, 11: 2, 12: 1}
-    analytic_probs = {s: c / 36 for s, c in analytic_counts.items()}
+    remaining = n_rolls
+    while remaining > 0:
+        m = min(chunk_size, remaining)
+        sums = rng.integers(1, faces, size=m, dtype=dtype, endpoint=True)
+        for _ in range(n_dice - 1):
+            sums += rng.integers(1, faces, size=m, dtype=dtype, endpoint=True)
+        hist += np.bincount(sums, minlength=max_sum + 1)
+        remaining -= m
 
-    # Таблиця порівняння
+    return hist
+
+
+def _hist_to_counter(hist: np.ndarray) -> Counter:
+    return Counter({s: int(c) for s, c in enumerate(hist) if c})
+
+
+def _worker_histogram(seed_seq: np.random.SeedSequence, n_rolls: int, n_dice: int, faces: int,
+                      chunk_size: int) -> np.ndarray:
+    """Задача для процесу-воркера: власний незалежний потік випадкових чисел."""
+    return _roll_histogram(np.random.default_rng(seed_seq), n_rolls, n_dice, faces, chunk_size)
+
+
+def simulate_dice(n_rolls: int, n_dice: int = 2, faces: int = 6, seed: int = 123,
+                  chunk_size: int = CHUNK_SIZE, workers: int = 1) -> Counter:
+    """
+    Векторизована (NumPy) Monte Carlo симуляція кидків n_dice кубиків з faces гранями.
+    workers > 1 — розподіляє кидки між процесами; кожен отримує незалежний потік,
+    породжений з seed через SeedSequence.spawn, гістограми сумуються в кінці.
+    Однакові (seed, workers, chunk_size) дають однаковий результат.
+    """
+    if workers <= 1:
+        rng = np.random.default_rng(seed)
+        return _hist_to_counter(_roll_histogram(rng, n_rolls, n_dice, faces, chunk_size))
+
+    streams = np.random.SeedSequence(seed).spawn(workers)
+    base, extra = divmod(n_rolls, workers)
+    shares = [base + (1 if i < extra else 0) for i in range(workers)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hists = pool.map(
+            _worker_histogram,
+            streams,
+            shares,
+            [n_dice] * workers,
+            [faces] * workers,
+            [chunk_size] * workers,
+        )
+        total = sum(hists)
+
+    return _hist_to_counter(total)
+
+
+# ---------- ТОЧНИЙ РОЗПОДІЛ СУМИ (ЗГОРТКА МНОГОЧЛЕНІВ) ----------
+# Розподіл суми k кубиків — коефіцієнти многочлена (x + x^2 + ... + x^faces)^k.
+# Степінь рахується повторним піднесенням до квадрата: O(log k) згорток.
+
+def _convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if min(len(a), len(b)) < FFT_THRESHOLD:
+        return np.convolve(a, b)
+
+    n = len(a) + len(b) - 1
+    size = 1 << (n - 1).bit_length()
+    out = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:n]
+    np.clip(out, 0.0, None, out=out)  # прибираємо від'ємний шум округлення FFT
+    return out
+
+
+def _convolve_exact(a: tuple, b: tuple) -> tuple:
+    out = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                out[i + j] += x * y
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def _sum_pmf(n_dice: int, faces: int) -> np.ndarray:
+    """pmf[s] — ймовірність суми s (масив лише для читання, кешується)."""
+    if n_dice < 1 or faces < 1:
+        raise ValueError("Потрібен хоча б один кубик з хоча б однією гранню.")
+
+    if n_dice == 1:
+        pmf = np.full(faces + 1, 1.0 / faces)
+        pmf[0] = 0.0
+    else:
+        half = _sum_pmf(n_dice // 2, faces)
+        pmf = _convolve(half, half)
+        if n_dice % 2:
+            pmf = _convolve(pmf, _sum_pmf(1, faces))
+        pmf /= pmf.sum()
+
+    pmf.flags.writeable = False
+    return pmf
+
+
+@lru_cache(maxsize=None)
+def _sum_counts(n_dice: int, faces: int) -> tuple:
+    """counts[s] — точна (ціла) кількість способів отримати суму s."""
+    if n_dice < 1 or faces < 1:
+        raise ValueError("Потрібен хоча б один кубик з хоча б однією гранню.")
+
+    if n_dice == 1:
+        return (0,) + (1,) * faces
+
+    half = _sum_counts(n_dice // 2, faces)
+    counts = _convolve_exact(half, half)
+    if n_dice % 2:
+        counts = _convolve_exact(counts, _sum_counts(1, faces))
+    return counts
+
+
+def analytic_counts(n_dice: int = 2, faces: int = 6) -> dict:
+    """Точна кількість способів отримати кожну суму (із faces ** n_dice комбінацій)."""
+    counts = _sum_counts(n_dice, faces)
+    return {s: counts[s] for s in range(n_dice, n_dice * faces + 1)}
+
+
+def analytic_probs(n_dice: int = 2, faces: int = 6) -> dict:
+    """Теоретична ймовірність кожної суми n_dice кубиків з faces гранями."""
+    pmf = _sum_pmf(n_dice, faces)
+    return {s: float(pmf[s]) for s in range(n_dice, n_dice * faces + 1)}
+
+
+def ci_half_width(counts: Counter, n_rolls: int, confidence: float = 0.95) -> float:
+    """Найбільша (по всіх сумах) півширина довірчого інтервалу для ймовірності суми."""
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    worst = 0.0
+    for c in counts.values():
+        p = c / n_rolls
+        worst = max(worst, z * (p * (1 - p) / n_rolls) ** 0.5)
+    return worst
+
+
+def chi_square(counts: Counter, n_rolls: int, probs: dict) -> float:
+    """Статистика хі-квадрат емпіричних частот проти теоретичних probs."""
+    return sum((counts.get(s, 0) - n_rolls * p) ** 2 / (n_rolls * p) for s, p in probs.items() if p > 0)
+
+
+def stream_simulation(n_rolls: int = None, every: int = 100_000, n_dice: int = 2, faces: int = 6,
+                      seed: int = 123):
+    """
+    Потокова Monte Carlo симуляція: кожні every кидків повертає Snapshot
+    з накопиченими частотами та поточною найбільшою абсолютною похибкою
+    проти analytic_probs. n_rolls=None — нескінченно, доки споживач не зупиниться.
+    """
+    if n_rolls is not None and n_rolls < 1:
+        raise ValueError("n_rolls має бути >= 1 (або None).")
+    if every < 1:
+        raise ValueError("every має бути >= 1.")
+
+    probs = _sum_pmf(n_dice, faces)
+    rng = np.random.default_rng(seed)
+    hist = np.zeros(n_dice * faces + 1, dtype=np.int64)
+    done = 0
+
+    while n_rolls is None or done < n_rolls:
+        m = every if n_rolls is None else min(every, n_rolls - done)
+        hist += _roll_histogram(rng, m, n_dice, faces)
+        done += m
+
+        max_error = float(np.abs(hist / done - probs).max())
+        yield Snapshot(_hist_to_counter(hist), done, max_error)
+
+
+def simulate_until(tolerance: float, n_dice: int = 2, faces: int = 6, seed: int = 123,
+                   confidence: float = 0.95, batch_size: int = 100_000,
+                   max_rolls: int = 10 ** 9):
+    """
+    Адаптивна Monte Carlo симуляція: кидає порціями по batch_size, доки
+    півширина довірчого інтервалу (рівень confidence) для кожної суми
+    не стане <= tolerance (в одиницях ймовірності) або не вичерпається max_rolls.
+    Повертає (counts, кількість витрачених кидків, досягнута півширина).
+    """
+    if max_rolls < 1:
+        raise ValueError("max_rolls має бути >= 1.")
+
+    for snap in stream_simulation(max_rolls, batch_size, n_dice, faces, seed):
+        half_width = ci_half_width(snap.counts, snap.n_rolls, confidence)
+        if half_width <= tolerance:
+            break
+
+    return snap.counts, snap.n_rolls, half_width
+
+
+# ---------- ТАБЛИЦЯ ТА ГРАФІКИ ----------
+# Приймають як фінальний результат (counts, N), так і знімок потоку (snap.counts, snap.n_rolls).
+
+def comparison_table(counts: Counter, n_rolls: int, probs: dict) -> pd.DataFrame:
     rows = []
-    for s in range(2, 13):
-        mc = sim_probs[s]
-        an = analytic_probs[s]
+    for s, an in probs.items():
+        mc = counts.get(s, 0) / n_rolls
         diff_pp = abs(mc - an) * 100  # різниця у відсоткових пунктах
         rows.append({
             "Sum": s,
             "MonteCarlo %": mc * 100,
             "Analytic %": an * 100,
             "Abs diff (pp)": diff_pp,
-            "Counts": sim_counts.get(s, 0)
+            "Counts": counts.get(s, 0)
         })
+    return pd.DataFrame(rows)
 
-    df = pd.DataFrame(rows)
 
-    # Красивий друк у консоль
+def print_table(df: pd.DataFrame):
     print(df.to_string(
         index=False,
         formatters={
@@ -51,24 +253,26 @@ def main():
         }
     ))
 
-    # Графік: Monte Carlo vs Analytic
-    sums = list(range(2, 13))
-    mc_vals = [sim_probs[s] * 100 for s in sums]
-    an_vals = [analytic_probs[s] * 100 for s in sums]
 
+def plot_comparison(counts: Counter, n_rolls: int, probs: dict):
+    sums = list(probs)
+    mc_vals = [counts.get(s, 0) / n_rolls * 100 for s in sums]
+    an_vals = [probs[s] * 100 for s in sums]
+
+    # Графік: Monte Carlo vs Analytic
     plt.figure(figsize=(9, 4.8))
     plt.plot(sums, mc_vals, marker="o", label="Monte Carlo (%)")
     plt.plot(sums, an_vals, marker="s", label="Analytic (%)")
     plt.xticks(sums)
     plt.xlabel("Sum of two dice")
     plt.ylabel("Probability (%)")
-    plt.title(f"Two dice: Monte Carlo vs Analytic (N={N:,} rolls)")
+    plt.title(f"Two dice: Monte Carlo vs Analytic (N={n_rolls:,} rolls)")
     plt.grid(True, alpha=0.25)
     plt.legend()
     plt.show()
 
     # Графік: абсолютна похибка (в п.п.)
-    absdiff = [abs(sim_probs[s] - analytic_probs[s]) * 100 for s in sums]
+    absdiff = [abs(mc - an) for mc, an in zip(mc_vals, an_vals)]
     plt.figure(figsize=(9, 4.2))
     plt.bar(sums, absdiff)
     plt.xticks(sums)
@@ -79,5 +283,50 @@ def main():
     plt.show()
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Monte Carlo: сума двох кубиків")
+    parser.add_argument("-n", "--rolls", type=int, default=1_000_000,
+                        help="кількість симуляцій (якщо не задано --tolerance)")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="зупинитися, щойно 95%% довірчий інтервал кожної ймовірності <= tolerance")
+    parser.add_argument("--workers", type=int, default=1, help="кількість процесів")
+    parser.add_argument("--every", type=int, default=None,
+                        help="показувати проміжні результати кожні EVERY кидків")
+    args = parser.parse_args()
+
+    if args.rolls < 1:
+        parser.error("Кількість симуляцій має бути >= 1.")
+    if args.every is not None and args.every < 1:
+        parser.error("--every має бути >= 1.")
+    if args.workers < 1:
+        parser.error("--workers має бути >= 1.")
+    # Адаптивний і потоковий режими працюють в одному процесі
+    if args.workers != 1 and (args.tolerance is not None or args.every):
+        parser.error("--workers не можна поєднувати з --tolerance або --every.")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if args.tolerance is not None:
+        sim_counts, N, half_width = simulate_until(args.tolerance, n_dice=2, faces=6, seed=123)
+        print(f"Витрачено {N:,} кидків; півширина 95% довірчого інтервалу = {half_width * 100:.4f} п.п.")
+    elif args.every:
+        for snap in stream_simulation(args.rolls, args.every, n_dice=2, faces=6, seed=123):
+            print(f"  {snap.n_rolls:>12,} кидків: макс. похибка {snap.max_error * 100:.4f} п.п.")
+        sim_counts, N = snap.counts, snap.n_rolls
+    else:
+        N = args.rolls  # кількість симуляцій
+        sim_counts = simulate_dice(N, n_dice=2, faces=6, seed=123, workers=args.workers)
+
+    an_probs = analytic_probs(2, 6)
+    print(f"Хі-квадрат проти аналітики: {chi_square(sim_counts, N, an_probs):.3f} (10 ступенів свободи)\n")
+
+    # Таблиця порівняння
+    print_table(comparison_table(sim_counts, N, an_probs))
+    plot_comparison(sim_counts, N, an_probs)
+
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,11 @@
 # greedy_algorithm & dinamic_programming
+import time
+from collections import Counter, OrderedDict
+from math import gcd
 from typing import Dict, List, Tuple
 
+import numpy as np
+
 items = {
     "pizza": {"cost": 50, "calories": 300},
     "hamburger": {"cost": 40, "calories": 250},
@@ -77,6 +82,428 @@ def dynamic_programming(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[
     return chosen, total_cost, total_calories
 
 
+def _decision_bits(costs: List[int], calories: List[int], budget: int) -> List[np.ndarray]:
+    """
+    Один прохід DP з одним рядком dp (NumPy).
+    Повертає decisions[i] = packbits(брати i-ту страву при бюджеті b) для b = 0..budget.
+    """
+    # dp[b] = max calories з уже розглянутих страв при бюджеті b
+    dp = np.zeros(budget + 1, dtype=np.int64)
+    decisions = []
+
+    for c, cal in zip(costs, calories):
+        take = np.zeros(budget + 1, dtype=bool)
+        if c <= budget:
+            with_item = dp[:budget + 1 - c] + cal  # новий масив, старий рядок не змінюється
+            take[c:] = with_item > dp[c:]
+            dp[c:] = np.where(take[c:], with_item, dp[c:])
+        decisions.append(np.packbits(take))
+
+    return decisions
+
+
+def _recover_choice(decisions: List[np.ndarray], names: List[str], costs: List[int], budget: int) -> List[str]:
+    """Відновлює вибір за бітами рішень; працює для будь-якого budget, не більшого за розмір таблиці."""
+    chosen = []
+    b = budget
+    for i in range(len(names) - 1, -1, -1):
+        if (decisions[i][b >> 3] >> (7 - (b & 7))) & 1:
+            chosen.append(names[i])
+            b -= costs[i]
+
+    chosen.reverse()
+    return chosen
+
+
+def dynamic_programming_compact(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[List[str], int, int]:
+    """
+    Той самий 0/1 knapsack, але без повної таблиці (n+1) x (budget+1):
+    зберігається лише один рядок dp (NumPy), який оновлюється зрізами,
+    а для відновлення вибору — бітова матриця рішень "брати i-й чи ні"
+    (1 біт на клітинку замість цілого числа).
+    Результат збігається з dynamic_programming.
+    """
+    names = list(items.keys())
+    costs = [items[n]["cost"] for n in names]
+    calories = [items[n]["calories"] for n in names]
+
+    decisions = _decision_bits(costs, calories, budget)
+    chosen = _recover_choice(decisions, names, costs, budget)
+
+    total_cost = sum(items[name]["cost"] for name in chosen)
+    total_calories = sum(items[name]["calories"] for name in chosen)
+    return chosen, total_cost, total_calories
+
+
+def dynamic_programming_sparse(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[List[str], int, int]:
+    """
+    0/1 knapsack на списку Парето-оптимальних станів (вартість, калорії):
+    зберігаються лише стани, для яких немає дешевшого або такого ж за ціною
+    стану з не меншою кількістю калорій. Не залежить від величини budget,
+    тому вигідний, коли різних сум вартостей мало.
+    """
+    names = list(items.keys())
+
+    # Стан: (cost, calories, chain), chain = (індекс страви, попередній chain) або None
+    states = [(0, 0, None)]
+
+    for i, name in enumerate(names):
+        c = items[name]["cost"]
+        cal = items[name]["calories"]
+        shifted = [(sc + c, scal + cal, (i, chain)) for sc, scal, chain in states if sc + c <= budget]
+
+        # Злиття двох списків, відсортованих за cost, з відкиданням домінованих станів
+        merged = []
+        a = b = 0
+        while a < len(states) or b < len(shifted):
+            if b == len(shifted) or (a < len(states) and (
+                    states[a][0] < shifted[b][0]
+                    or (states[a][0] == shifted[b][0] and states[a][1] >= shifted[b][1]))):
+                state = states[a]
+                a += 1
+            else:
+                state = shifted[b]
+                b += 1
+            if not merged or state[1] > merged[-1][1]:
+                merged.append(state)
+        states = merged
+
+    # Найбільше калорій має останній (найдорожчий) Парето-стан
+    _, _, chain = states[-1]
+    chosen = []
+    while chain is not None:
+        i, chain = chain
+        chosen.append(names[i])
+    chosen.reverse()
+
+    total_cost = sum(items[name]["cost"] for name in chosen)
+    total_calories = sum(items[name]["calories"] for name in chosen)
+    return chosen, total_cost, total_calories
+
+
+# У скільки разів ітерація розрідженого алгоритму дорожча за клітинку NumPy-рядка
+SPARSE_COST_FACTOR = 32
+
+
+def scale_by_gcd(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[Dict[str, Dict[str, int]], int]:
+    """Ділить усі вартості на їхній НСД, а бюджет — націло на нього ж."""
+    g = 0
+    for data in items.values():
+        g = gcd(g, data["cost"])
+    if g <= 1:
+        return items, budget
+
+    scaled = {name: {**data, "cost": data["cost"] // g} for name, data in items.items()}
+    return scaled, budget // g
+
+
+def estimate_states(items: Dict[str, Dict[str, int]], budget: int) -> int:
+    """
+    Верхня оцінка кількості різних сум вартостей:
+    добуток (кількість страв із такою ціною + 1) по всіх різних цінах, не більше budget + 1.
+    """
+    estimate = 1
+    for count in Counter(data["cost"] for data in items.values()).values():
+        estimate *= count + 1
+        if estimate > budget:
+            return budget + 1
+    return estimate
+
+
+def knapsack_auto(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[List[str], int, int]:
+    """
+    0/1 knapsack з автоматичним вибором рушія:
+    спершу вартості та бюджет скорочуються на НСД вартостей,
+    далі — розріджений Парето-алгоритм, якщо станів очікується мало,
+    інакше — щільний dynamic_programming_compact.
+    """
+    scaled, scaled_budget = scale_by_gcd(items, budget)
+
+    if estimate_states(scaled, scaled_budget) * SPARSE_COST_FACTOR < scaled_budget + 1:
+        chosen, _, _ = dynamic_programming_sparse(scaled, scaled_budget)
+    else:
+        chosen, _, _ = dynamic_programming_compact(scaled, scaled_budget)
+
+    total_cost = sum(items[name]["cost"] for name in chosen)
+    total_calories = sum(items[name]["calories"] for name in chosen)
+    return chosen, total_cost, total_calories
+
+
+def catalog_fingerprint(items: Dict[str, Dict[str, int]]) -> tuple:
+    """Незмінний відбиток каталогу: змінюється при будь-якій зміні назв, порядку, цін чи калорій."""
+    return tuple((name, data["cost"], data["calories"]) for name, data in items.items())
+
+
+class KnapsackSolver:
+    """
+    Відповідає на багато бюджетів для одного каталогу items:
+    DP рахується один раз до найбільшого запитаного бюджету, а вибір
+    для кожного меншого бюджету відновлюється з тих самих бітів рішень.
+    Таблиці (~ n * budget / 8 байтів кожна) кешуються за відбитком каталогу,
+    спільно для всіх екземплярів, але не більше ніж для TABLE_CACHE_SIZE
+    останніх каталогів (LRU).
+    Для жадібного алгоритму будується індекс страв, відсортованих за calories/cost.
+    Каталог копіюється при створенні: подальші зміни items на розвʼязувач
+    не впливають — для зміненого каталогу створіть новий KnapsackSolver.
+    """
+
+    TABLE_CACHE_SIZE = 2
+    _tables = OrderedDict()  # відбиток каталогу -> (budget, decisions)
+
+    def __init__(self, items: Dict[str, Dict[str, int]]):
+        items = {name: dict(data) for name, data in items.items()}
+        self.items = items
+        self.fingerprint = catalog_fingerprint(items)
+        self.names = list(items.keys())
+        self.costs = [items[n]["cost"] for n in self.names]
+        self.calories = [items[n]["calories"] for n in self.names]
+        self._answers = {}
+
+        # Індекс для greedy: той самий порядок, що й у greedy_algorithm
+        ranked = sorted(self.names, key=lambda n: items[n]["calories"] / items[n]["cost"], reverse=True)
+        self._ranked = ranked
+        self._ranked_costs = [items[n]["cost"] for n in ranked]
+        self._prefix_costs = [0]
+        for c in self._ranked_costs:
+            self._prefix_costs.append(self._prefix_costs[-1] + c)
+        self._build_min_tree()
+
+    @classmethod
+    def clear_cache(cls):
+        cls._tables.clear()
+
+    # ---------- ДИНАМІЧНЕ ПРОГРАМУВАННЯ ----------
+    def _decisions_for(self, budget: int) -> List[np.ndarray]:
+        tables = self._tables
+        cached = tables.get(self.fingerprint)
+        if cached is None or cached[0] < budget:
+            tables.pop(self.fingerprint, None)  # спершу звільняємо стару таблицю
+            cached = (budget, _decision_bits(self.costs, self.calories, budget))
+            tables[self.fingerprint] = cached
+            while len(tables) > self.TABLE_CACHE_SIZE:
+                tables.popitem(last=False)
+        tables.move_to_end(self.fingerprint)
+        return cached[1]
+
+    def solve(self, budget: int) -> Tuple[List[str], int, int]:
+        """Те саме, що dynamic_programming(items, budget)."""
+        return self.solve_many([budget])[0]
+
+    def solve_many(self, budgets: List[int]) -> List[Tuple[List[str], int, int]]:
+        """Відповіді для списку бюджетів з одного проходу DP (до найбільшого з них)."""
+        missing = [b for b in budgets if b not in self._answers]
+        if missing:
+            decisions = self._decisions_for(max(missing))
+            for b in missing:
+                chosen = _recover_choice(decisions, self.names, self.costs, b)
+                total_cost = sum(self.items[name]["cost"] for name in chosen)
+                total_calories = sum(self.items[name]["calories"] for name in chosen)
+                self._answers[b] = (chosen, total_cost, total_calories)
+
+        return [self._answers[b] for b in budgets]
+
+    # ---------- ЖАДІБНИЙ АЛГОРИТМ ----------
+    def _build_min_tree(self):
+        # Дерево відрізків мінімальних цін: швидко знаходить наступну страву, що влазить у залишок
+        size = 1
+        while size < len(self._ranked_costs):
+            size *= 2
+        tree = [float("inf")] * (2 * size)
+        tree[size:size + len(self._ranked_costs)] = self._ranked_costs
+        for i in range(size - 1, 0, -1):
+            tree[i] = min(tree[2 * i], tree[2 * i + 1])
+        self._tree_size = size
+        self._min_tree = tree
+
+    def _next_fitting(self, start: int, remaining: int) -> int:
+        """Перший індекс >= start у ranked з ціною <= remaining (або -1) за O(log n)."""
+        tree, size = self._min_tree, self._tree_size
+        if start >= len(self._ranked_costs):
+            return -1
+
+        # Піднімаємося від листа start, доки не знайдемо правий відрізок з мінімумом <= remaining
+        i = start + size
+        if tree[i] <= remaining:
+            return start
+        while True:
+            while i & 1:  # правий син — піднімаємося, поки не станемо лівим
+                i >>= 1
+                if i == 0:
+                    return -1
+            i += 1  # сусідній правий відрізок
+            if tree[i] <= remaining:
+                break
+        # Спускаємося до найлівішого листа з ціною <= remaining
+        while i < size:
+            i = 2 * i if tree[2 * i] <= remaining else 2 * i + 1
+        return i - size
+
+    def greedy(self, budget: int) -> Tuple[List[str], int, int]:
+        """
+        Те саме, що greedy_algorithm(items, budget), але за O(log n) на кожну вибрану страву:
+        найдовший префікс, що влазить у бюджет, — бінарним пошуком,
+        далі — стрибки до наступної страви, яка ще влазить.
+        """
+        prefix = self._prefix_costs
+        lo, hi = 0, len(self._ranked)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if prefix[mid] <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+
+        chosen = self._ranked[:lo]
+        total_cost = prefix[lo]
+        i = self._next_fitting(lo, budget - total_cost)
+        while i != -1:
+            chosen.append(self._ranked[i])
+            total_cost += self._ranked_costs[i]
+            i = self._next_fitting(i + 1, budget - total_cost)
+
+        total_calories = sum(self.items[name]["calories"] for name in chosen)
+        return chosen, total_cost, total_calories
+
+
+# ---------- ОБМЕЖЕНА КІЛЬКІСТЬ ТА КІЛЬКА ОБМЕЖЕНЬ ----------
+# Страва може мати "quantity" (скільки разів її можна взяти, за замовчуванням 1)
+# та довільні додаткові виміри обмежень (наприклад, "weight").
+
+def _expand_choice(names: List[str], counts: Dict[str, int]) -> List[str]:
+    """Список вибраних страв з повторами, у порядку каталогу."""
+    return [name for name in names for _ in range(counts.get(name, 0))]
+
+
+def bounded_knapsack(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[List[str], int, int]:
+    """
+    Knapsack з обмеженою кількістю кожної страви ("quantity").
+    Кількість q розбивається на частини 1, 2, 4, ..., залишок (двійкове розбиття),
+    після чого розвʼязується звичайна 0/1 задача на O(n log q) частинах.
+    Повертає (список страв з повторами, сумарна вартість, сумарні калорії).
+    """
+    names = list(items.keys())
+    owners, costs, calories = [], [], []
+
+    for name in names:
+        data = items[name]
+        q = data.get("quantity", 1)
+        part = 1
+        while q > 0:
+            take = min(part, q)
+            owners.append((name, take))
+            costs.append(data["cost"] * take)
+            calories.append(data["calories"] * take)
+            q -= take
+            part *= 2
+
+    decisions = _decision_bits(costs, calories, budget)
+    parts = _recover_choice(decisions, list(range(len(owners))), costs, budget)
+
+    counts = Counter()
+    for i in parts:
+        name, take = owners[i]
+        counts[name] += take
+
+    chosen = _expand_choice(names, counts)
+    total_cost = sum(items[name]["cost"] for name in chosen)
+    total_calories = sum(items[name]["calories"] for name in chosen)
+    return chosen, total_cost, total_calories
+
+
+def _ratio(calories: int, weight: int) -> float:
+    return calories / weight if weight else float("inf")
+
+
+def branch_and_bound(items: Dict[str, Dict[str, int]], limits: Dict[str, int],
+                     time_limit: float = None) -> Tuple[List[str], Dict[str, int], int]:
+    """
+    Метод гілок і меж для knapsack з кількома обмеженнями (limits, напр. {"cost": 100, "weight": 40})
+    та обмеженою кількістю страв ("quantity").
+    Страви перебираються в порядку greedy_algorithm (calories / перший вимір limits);
+    верхня межа — дробовий (LP) knapsack за кожним виміром окремо, береться найменша.
+    Початковий розвʼязок — жадібний. Якщо задано time_limit (секунди) і час вичерпано,
+    повертається найкращий знайдений розвʼязок (не обовʼязково оптимальний).
+    Повертає (список страв з повторами, використано по кожному виміру, сумарні калорії).
+    """
+    dims = list(limits)
+    catalog = list(items.keys())
+    names = sorted(catalog, key=lambda nm: _ratio(items[nm]["calories"], items[nm].get(dims[0], 0)), reverse=True)
+    n = len(names)
+    weights = [[items[nm].get(d, 0) for d in dims] for nm in names]
+    cals = [items[nm]["calories"] for nm in names]
+    qty = [items[nm].get("quantity", 1) for nm in names]
+
+    # Для LP-межі за виміром j страви впорядковані за calories / weight_j
+    orders = [sorted(range(n), key=lambda i: _ratio(cals[i], weights[i][j]), reverse=True)
+              for j in range(len(dims))]
+
+    def max_count(i, remaining):
+        t = qty[i]
+        for w, cap in zip(weights[i], remaining):
+            if w:
+                t = min(t, cap // w)
+        return t
+
+    def upper_bound(k, remaining, value):
+        best = float("inf")
+        for j, order in enumerate(orders):
+            cap = remaining[j]
+            bound = value
+            for i in order:
+                if i < k:
+                    continue  # уже вирішені страви
+                w = weights[i][j] * qty[i]
+                if w <= cap:
+                    cap -= w
+                    bound += cals[i] * qty[i]
+                else:
+                    bound += cals[i] * cap / weights[i][j]
+                    break
+            best = min(best, bound)
+        return best
+
+    # Жадібний початковий розвʼязок
+    remaining = [limits[d] for d in dims]
+    best_value = 0
+    best_counts = {}
+    for i in range(n):
+        t = max_count(i, remaining)
+        if t:
+            best_counts[names[i]] = t
+            best_value += t * cals[i]
+            remaining = [cap - t * w for cap, w in zip(remaining, weights[i])]
+
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+
+    # Пошук у глибину без рекурсії: (страва k, залишок по вимірах, калорії, ланцюжок вибору)
+    stack = [(0, tuple(limits[d] for d in dims), 0, None)]
+    while stack:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+
+        k, remaining, value, chain = stack.pop()
+        if value > best_value:
+            best_value = value
+            best_counts = {}
+            link = chain
+            while link is not None:
+                i, t, link = link
+                best_counts[names[i]] = t
+
+        if k == n or upper_bound(k, remaining, value) <= best_value:
+            continue
+
+        # Спершу (останньою в стек) — максимальна кількість k-ї страви
+        w_k = weights[k]
+        for t in range(max_count(k, remaining) + 1):
+            child_remaining = tuple(cap - t * w for cap, w in zip(remaining, w_k))
+            stack.append((k + 1, child_remaining, value + t * cals[k], (k, t, chain) if t else chain))
+
+    chosen = _expand_choice(catalog, best_counts)
+    totals = {d: sum(items[name].get(d, 0) for name in chosen) for d in dims}
+    return chosen, totals, best_value
+
+
 if __name__ == "__main__":
     budget = 100
 
@@ -95,3 +522,38 @@ if __name__ == "__main__":
     print("  Chosen:", d_items)
     print("  Total cost:", d_cost)
     print("  Total calories:", d_cal)
+    print()
+
+    c_items, c_cost, c_cal = dynamic_programming_compact(items, budget)
+    print("Dynamic programming (compact, NumPy):")
+    print("  Chosen:", c_items)
+    print("  Total cost:", c_cost)
+    print("  Total calories:", c_cal)
+    print()
+
+    a_items, a_cost, a_cal = knapsack_auto(items, budget)
+    print("Dynamic programming (auto: GCD + dense/sparse):")
+    print("  Chosen:", a_items)
+    print("  Total cost:", a_cost)
+    print("  Total calories:", a_cal)
+    print()
+
+    solver = KnapsackSolver(items)
+    print("KnapsackSolver (один прохід DP на всі бюджети):")
+    for b, (s_items, s_cost, s_cal) in zip([50, 75, 100], solver.solve_many([50, 75, 100])):
+        print(f"  Budget {b}: {s_items}, cost={s_cost}, calories={s_cal}")
+    print()
+
+    # Обмежена кількість і друге обмеження (вага, умовні одиниці)
+    menu = {name: {**data, "quantity": 2, "weight": data["cost"] // 5 + 3} for name, data in items.items()}
+    q_items, q_cost, q_cal = bounded_knapsack(menu, budget)
+    print("Bounded knapsack (до 2 порцій кожної страви):")
+    print("  Chosen:", q_items)
+    print("  Total cost:", q_cost)
+    print("  Total calories:", q_cal)
+
+    m_items, m_totals, m_cal = branch_and_bound(menu, {"cost": budget, "weight": 30}, time_limit=1.0)
+    print("Branch and bound (cost <= 100, weight <= 30):")
+    print("  Chosen:", m_items)
+    print("  Totals:", m_totals)
+    print("  Total calories:", m_cal)
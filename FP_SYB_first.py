@@ -1,40 +1,118 @@
 # Реверсування, сортування вставками та обʼєднання в один відсортований список на прикладі реализації списку з конспекту
+import heapq
+import sys
+from array import array
+
+
 class Node:
+    __slots__ = ("data", "next")  # без __dict__ — значно менше памʼяті на вузол
+
     def __init__(self, data=None):
         self.data = data
         self.next = None
 
 
+# Скільки елементів записувати за один виклик write
+WRITE_CHUNK_SIZE = 8192
+
+
+def _write_values(values, fileobj, sep, end, chunk_size):
+    """Записує значення через sep порціями по chunk_size; end — після останнього."""
+    write = fileobj.write
+    chunk = []
+    wrote_any = False
+
+    for data in values:
+        chunk.append(str(data))
+        if len(chunk) >= chunk_size:
+            if wrote_any:
+                write(sep)
+            write(sep.join(chunk))
+            wrote_any = True
+            chunk.clear()
+
+    if chunk:
+        if wrote_any:
+            write(sep)
+        write(sep.join(chunk))
+        wrote_any = True
+
+    if wrote_any:
+        write(end)
+
+
 class LinkedList:
     def __init__(self):
         self.head = None
+        self.tail = None  # останній вузол — вставка в кінець за O(1)
+        self.size = 0     # кількість вузлів
+
+    # ---------- ПОБУДОВА З ПОСЛІДОВНОСТІ ----------
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Створює список з елементів iterable за один прохід."""
+        lst = cls()
+        lst.extend(iterable)
+        return lst
+
+    def extend(self, iterable):
+        """Додає всі елементи iterable в кінець списку за один прохід."""
+        tail = self.tail
+        added = 0
+        for data in iterable:
+            new_node = Node(data)
+            if tail is None:
+                self.head = new_node
+            else:
+                tail.next = new_node
+            tail = new_node
+            added += 1
+
+        self.tail = tail
+        self.size += added
 
     # ---------- ВСТАВКИ ----------
     def insert_at_beginning(self, data):
         new_node = Node(data)
         new_node.next = self.head
         self.head = new_node
+        if self.tail is None:
+            self.tail = new_node
+        self.size += 1
 
     def insert_at_end(self, data):
         new_node = Node(data)
-        if not self.head:
+        if self.tail is None:
             self.head = new_node
-            return
+        else:
+            self.tail.next = new_node
+        self.tail = new_node
+        self.size += 1
 
+    # ---------- ІТЕРАЦІЯ / ВИВІД ----------
+    def __iter__(self):
         cur = self.head
-        while cur.next:
+        while cur:
+            yield cur.data
             cur = cur.next
-        cur.next = new_node
+
+    def __len__(self):
+        return self.size
+
+    def to_list(self):
+        return list(self)
+
+    def write_to(self, fileobj, sep="\n", end="\n", chunk_size=WRITE_CHUNK_SIZE):
+        """Буферизовано записує значення у fileobj: один write на chunk_size елементів."""
+        _write_values(self, fileobj, sep, end, chunk_size)
 
     # ---------- ДРУК ----------
     def print_list(self):
-        cur = self.head
-        while cur:
-            print(cur.data)
-            cur = cur.next
+        self.write_to(sys.stdout)
 
     # ---------- РЕВЕРС ----------
     def reverse(self):
+        self.tail = self.head
         prev = None
         current = self.head
 
@@ -47,22 +125,39 @@ class LinkedList:
         self.head = prev
 
     # ---------- СОРТУВАННЯ ВСТАВКАМИ ----------
-    def insertion_sort(self):
+    def insertion_sort(self, key=None, reverse=False):
+        """
+        Стабільне сортування вставками.
+        Елемент, не менший за поточний хвіст, дописується в кінець за O(1),
+        тому вже відсортовані дані обробляються за O(n).
+        """
         if not self.head or not self.head.next:
             return
 
+        key = key or _identity
         sorted_head = None
+        sorted_tail = None
         current = self.head
 
         while current:
             next_node = current.next
-
-            if sorted_head is None or current.data < sorted_head.data:
+            k = key(current.data)
+
+            if sorted_head is None:
+                current.next = None
+                sorted_head = sorted_tail = current
+            elif not _precedes(k, key(sorted_tail.data), reverse):
+                current.next = None
+                sorted_tail.next = current
+                sorted_tail = current
+            elif _precedes(k, key(sorted_head.data), reverse):
                 current.next = sorted_head
                 sorted_head = current
             else:
+                # Вставляємо після всіх рівних елементів — це зберігає стабільність.
+                # Хвіст точно "більший" за current, тож search.next не стане None.
                 search = sorted_head
-                while search.next and search.next.data < current.data:
+                while not _precedes(k, key(search.next.data), reverse):
                     search = search.next
 
                 current.next = search.next
@@ -71,41 +166,430 @@ class LinkedList:
             current = next_node
 
         self.head = sorted_head
+        self.tail = sorted_tail
+
+    # ---------- СОРТУВАННЯ ЗЛИТТЯМ ----------
+    def merge_sort(self, key=None, reverse=False):
+        """
+        Стабільне висхідне (без рекурсії) сортування злиттям за O(n log n).
+        Перелінковує наявні вузли, нових не створює.
+        Для малих списків (до INSERTION_SORT_CUTOFF) використовує insertion_sort.
+        """
+        n = self.size
+        if n < 2:
+            return
+
+        # Малі списки — сортуванням вставками
+        if n <= INSERTION_SORT_CUTOFF:
+            self.insertion_sort(key=key, reverse=reverse)
+            return
+
+        width = 1
+        while width < n:
+            new_head = None
+            new_tail = None
+            rest = self.head
+
+            while rest:
+                left = rest
+                left_tail, right = _split_after(left, width)
+                right_tail, rest = _split_after(right, width)
+
+                merged = merge_sorted_nodes(left, right, key=key, reverse=reverse)
+                if new_tail is None:
+                    new_head = merged
+                else:
+                    new_tail.next = merged
+
+                # Хвіст вичерпаної під час злиття серії отримав next.
+                if right is None or left_tail.next is None:
+                    new_tail = left_tail
+                else:
+                    new_tail = right_tail
+
+            self.head = new_head
+            self.tail = new_tail
+            width *= 2
 
     # ---------- MERGE ДВОХ ВІДСОРТОВАНИХ СПИСКІВ ----------
     def merge_sorted(self, other: "LinkedList"):
+        """
+        Обʼєднує other у self. Вузли other переходять до self,
+        тому other після злиття стає порожнім.
+        """
         self.head = merge_sorted_nodes(self.head, other.head)
 
+        # Хвіст вичерпаного списку під час злиття отримує next,
+        # тож новим хвостом стає той, у якого next лишився None.
+        if self.tail is None or self.tail.next is not None:
+            self.tail = other.tail
+        self.size += other.size
+
+        other.head = None
+        other.tail = None
+        other.size = 0
+
+
+# Поріг, до якого сортування вставками швидше за злиття
+INSERTION_SORT_CUTOFF = 32
+
+
+# ---------- ДОПОМІЖНІ ФУНКЦІЇ СОРТУВАННЯ ----------
+def _identity(x):
+    return x
+
+
+def _precedes(a, b, reverse=False):
+    """Чи має ключ a стояти строго перед ключем b."""
+    return b < a if reverse else a < b
+
+
+def _split_after(head, width):
+    """
+    Відрізає від head серію довжиною до width вузлів.
+    Повертає (хвіст серії, початок решти списку).
+    """
+    if head is None:
+        return None, None
+
+    cur = head
+    for _ in range(width - 1):
+        if cur.next is None:
+            break
+        cur = cur.next
+
+    rest = cur.next
+    cur.next = None
+    return cur, rest
+
 
 # ---------- ФУНКЦІЯ MERGE ДЛЯ ВУЗЛІВ ----------
-def merge_sorted_nodes(l1, l2):
+def merge_sorted_nodes(l1, l2, key=None, reverse=False):
+    """
+    Стабільно зливає два відсортовані ланцюжки вузлів.
+    При рівних ключах першими йдуть вузли з l1.
+    """
     if not l1:
         return l2
     if not l2:
         return l1
 
-    if l1.data <= l2.data:
+    key = key or _identity
+    k1 = key(l1.data)
+    k2 = key(l2.data)
+
+    if not _precedes(k2, k1, reverse):
         head = l1
         l1 = l1.next
+        if l1:
+            k1 = key(l1.data)
     else:
         head = l2
         l2 = l2.next
+        if l2:
+            k2 = key(l2.data)
 
     current = head
 
+    # Ключ кожного вузла обчислюється лише один раз
     while l1 and l2:
-        if l1.data <= l2.data:
+        if not _precedes(k2, k1, reverse):
             current.next = l1
             l1 = l1.next
+            if l1:
+                k1 = key(l1.data)
         else:
             current.next = l2
             l2 = l2.next
+            if l2:
+                k2 = key(l2.data)
         current = current.next
 
     current.next = l1 if l1 else l2
     return head
 
 
+# ---------- K-WAY MERGE ВІДСОРТОВАНИХ СПИСКІВ ----------
+def merge_k_sorted(lists, key=None):
+    """
+    Зливає будь-яку кількість відсортованих LinkedList в один за O(n log k)
+    за допомогою купи. Вузли перелінковуються (нових не створюється),
+    тому вхідні списки після злиття стають порожніми.
+    Злиття стабільне: при рівних ключах першими йдуть вузли зі списку,
+    що стоїть раніше в lists.
+    """
+    key = key or _identity
+    result = LinkedList()
+
+    # (ключ, номер списку, вузол) — номер списку розвʼязує нічиї,
+    # тож самі вузли ніколи не порівнюються
+    heap = []
+    for idx, lst in enumerate(lists):
+        if lst.head is not None:
+            heap.append((key(lst.head.data), idx, lst.head))
+        result.size += lst.size
+        lst.head = None
+        lst.tail = None
+        lst.size = 0
+    heapq.heapify(heap)
+
+    tail = None
+    while heap:
+        _, idx, node = heap[0]
+        nxt = node.next
+        if nxt is not None:
+            heapq.heapreplace(heap, (key(nxt.data), idx, nxt))
+        else:
+            heapq.heappop(heap)
+
+        if tail is None:
+            result.head = node
+        else:
+            tail.next = node
+        tail = node
+
+    if tail is not None:
+        tail.next = None
+    result.tail = tail
+    return result
+
+
+def iter_merge_sorted(sources, key=None):
+    """
+    Лінива версія k-way merge: по одному повертає значення у відсортованому
+    порядку, не змінюючи вузлів. sources — LinkedList або будь-які
+    відсортовані ітеровані обʼєкти (зокрема генератори, що видають дані поступово).
+    """
+    return heapq.merge(*sources, key=key)
+
+
+# ---------- СПИСОК НА МАСИВАХ ----------
+NIL = -1  # "порожнє посилання" для індексів
+
+
+class ArrayLinkedList:
+    """
+    Однозвʼязний список на паралельних масивах array замість обʼєктів Node:
+    values[i] — значення вузла i, nexts[i] — індекс наступного вузла (NIL = None).
+    Звільнені комірки звʼязуються через nexts у free list і використовуються повторно.
+    Значення мають відповідати typecode (за замовчуванням "q" — int64).
+    API збігається з LinkedList.
+    """
+
+    def __init__(self, typecode="q"):
+        self.values = array(typecode)
+        self.nexts = array("q")
+        self.head = NIL
+        self.tail = NIL
+        self.size = 0
+        self._free = NIL  # голова списку вільних комірок
+
+    # ---------- ПОБУДОВА З ПОСЛІДОВНОСТІ ----------
+    @classmethod
+    def from_iterable(cls, iterable, typecode="q"):
+        lst = cls(typecode)
+        lst.extend(iterable)
+        return lst
+
+    def extend(self, iterable):
+        for data in iterable:
+            self.insert_at_end(data)
+
+    # ---------- КОМІРКИ ----------
+    def _alloc(self, data):
+        i = self._free
+        if i != NIL:
+            self._free = self.nexts[i]
+            self.values[i] = data
+            self.nexts[i] = NIL
+        else:
+            i = len(self.values)
+            self.values.append(data)
+            self.nexts.append(NIL)
+        return i
+
+    def nbytes(self):
+        """Скільки байтів займають масиви (разом з вільними комірками)."""
+        return (len(self.values) * self.values.itemsize
+                + len(self.nexts) * self.nexts.itemsize)
+
+    def clear(self):
+        self.values = array(self.values.typecode)
+        self.nexts = array("q")
+        self.head = NIL
+        self.tail = NIL
+        self.size = 0
+        self._free = NIL
+
+    # ---------- ВСТАВКИ / ВИДАЛЕННЯ ----------
+    def insert_at_beginning(self, data):
+        i = self._alloc(data)
+        self.nexts[i] = self.head
+        self.head = i
+        if self.tail == NIL:
+            self.tail = i
+        self.size += 1
+
+    def insert_at_end(self, data):
+        i = self._alloc(data)
+        if self.tail == NIL:
+            self.head = i
+        else:
+            self.nexts[self.tail] = i
+        self.tail = i
+        self.size += 1
+
+    def pop_front(self):
+        """Видаляє перший вузол і повертає його значення; комірка йде у free list."""
+        if self.head == NIL:
+            raise IndexError("pop from empty list")
+
+        i = self.head
+        data = self.values[i]
+        self.head = self.nexts[i]
+        if self.head == NIL:
+            self.tail = NIL
+
+        self.nexts[i] = self._free
+        self._free = i
+        self.size -= 1
+        return data
+
+    # ---------- ІТЕРАЦІЯ / ВИВІД ----------
+    def __iter__(self):
+        values = self.values
+        nexts = self.nexts
+        i = self.head
+        while i != NIL:
+            yield values[i]
+            i = nexts[i]
+
+    def __len__(self):
+        return self.size
+
+    def to_list(self):
+        return list(self)
+
+    def write_to(self, fileobj, sep="\n", end="\n", chunk_size=WRITE_CHUNK_SIZE):
+        _write_values(self, fileobj, sep, end, chunk_size)
+
+    def print_list(self):
+        self.write_to(sys.stdout)
+
+    # ---------- РЕВЕРС ----------
+    def reverse(self):
+        nexts = self.nexts
+        self.tail = self.head
+        prev = NIL
+        current = self.head
+
+        while current != NIL:
+            next_node = nexts[current]
+            nexts[current] = prev
+            prev = current
+            current = next_node
+
+        self.head = prev
+
+    # ---------- СОРТУВАННЯ ----------
+    def insertion_sort(self, key=None, reverse=False):
+        """Стабільне сортування вставками, як LinkedList.insertion_sort."""
+        if self.head == NIL or self.nexts[self.head] == NIL:
+            return
+
+        key = key or _identity
+        values = self.values
+        nexts = self.nexts
+        sorted_head = NIL
+        sorted_tail = NIL
+        current = self.head
+
+        while current != NIL:
+            next_node = nexts[current]
+            k = key(values[current])
+
+            if sorted_head == NIL:
+                nexts[current] = NIL
+                sorted_head = sorted_tail = current
+            elif not _precedes(k, key(values[sorted_tail]), reverse):
+                nexts[current] = NIL
+                nexts[sorted_tail] = current
+                sorted_tail = current
+            elif _precedes(k, key(values[sorted_head]), reverse):
+                nexts[current] = sorted_head
+                sorted_head = current
+            else:
+                search = sorted_head
+                while not _precedes(k, key(values[nexts[search]]), reverse):
+                    search = nexts[search]
+
+                nexts[current] = nexts[search]
+                nexts[search] = current
+
+            current = next_node
+
+        self.head = sorted_head
+        self.tail = sorted_tail
+
+    def merge_sort(self, key=None, reverse=False):
+        """
+        Стабільне сортування за O(n log n): значення сортуються вбудованим sorted
+        і записуються назад компактно (комірки 0..n-1, free list очищується).
+        """
+        ordered = sorted(self, key=key, reverse=reverse)
+        self.clear()
+        self.extend(ordered)
+
+    # ---------- MERGE ДВОХ ВІДСОРТОВАНИХ СПИСКІВ ----------
+    def merge_sorted(self, other, key=None, reverse=False):
+        """
+        Обʼєднує відсортований other у self. Значення other копіюються
+        в масиви self, після чого other стає порожнім.
+        """
+        other_head = NIL
+        other_tail = NIL
+        for data in other:
+            i = self._alloc(data)
+            if other_tail == NIL:
+                other_head = i
+            else:
+                self.nexts[other_tail] = i
+            other_tail = i
+        added = other.size
+        other.clear()
+
+        key = key or _identity
+        values = self.values
+        nexts = self.nexts
+        a = self.head
+        b = other_head
+        head = NIL
+        tail = NIL
+
+        while a != NIL and b != NIL:
+            if not _precedes(key(values[b]), key(values[a]), reverse):
+                take, a = a, nexts[a]
+            else:
+                take, b = b, nexts[b]
+            if tail == NIL:
+                head = take
+            else:
+                nexts[tail] = take
+            tail = take
+
+        rest = a if a != NIL else b
+        if tail == NIL:
+            head = rest
+        else:
+            nexts[tail] = rest
+
+        # Якщо лишився хвіст other — він і є кінцем; інакше хвіст self не змінюється
+        if b != NIL:
+            self.tail = other_tail
+        self.head = head
+        self.size += added
+
+
 # =======================
 # ПРИКЛАД ВИКОРИСТАННЯ
 # =======================
@@ -129,6 +613,14 @@ list1.insertion_sort()
 print("\nПісля сортування вставками:")
 list1.print_list()
 
+list1.merge_sort(reverse=True)
+print("\nПісля сортування злиттям (спадно):")
+list1.print_list()
+
+list1.merge_sort()
+print("\nПісля сортування злиттям (зростаючи):")
+list1.print_list()
+
 # --- Другий відсортований список
 list2 = LinkedList()
 for x in [2, 12, 30]:
@@ -141,3 +633,19 @@ list2.print_list()
 list1.merge_sorted(list2)
 print("\nПісля обʼєднання двох відсортованих списків:")
 list1.print_list()
+
+# --- Обʼєднання кількох відсортованих списків
+shards = [LinkedList.from_iterable(xs) for xs in ([1, 4, 9], [3, 8], [0, 7, 11])]
+print("\nЛіниве злиття кількох списків:", list(iter_merge_sorted(shards)))
+
+merged = merge_k_sorted([list1] + shards)
+print("\nПісля обʼєднання кількох відсортованих списків:")
+merged.print_list()
+
+# --- Той самий API на масивах
+arr_list = ArrayLinkedList.from_iterable([15, 10, 5, 20, 25])
+arr_list.reverse()
+arr_list.insertion_sort()
+arr_list.merge_sorted(ArrayLinkedList.from_iterable([2, 12, 30]))
+print("\nArrayLinkedList після сортування та обʼєднання:", list(arr_list))
+print(f"Памʼять на елемент: {arr_list.nbytes() / arr_list.size:.0f} байт")
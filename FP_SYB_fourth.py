@@ -1,7 +1,12 @@
 # Створення дерева із купи
 import uuid
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+# До скількох вузлів малюємо через networkx з підписами; більші купи — draw_heap
+LABEL_LIMIT = 63
 
 
 class Node:
@@ -71,10 +76,184 @@ def heap_to_tree(heap, color="skyblue"):
     return nodes[0]
 
 
+# --------- ШВИДКА РОЗКЛАДКА БЕЗ РЕКУРСІЇ ТА NETWORKX ---------
+
+def heap_layout(n):
+    """
+    Координати вузлів купи з n елементів просто з індексів масиву, за O(n) і без рекурсії.
+    Вузол i лежить на глибині d = floor(log2(i + 1)) на позиції p = i - (2**d - 1) у рівні.
+    Кожен вузол найглибшого рівня займає одиницю ширини, тож вузли не накладаються
+    на жодній глибині. Повертає (x, y) — масиви NumPy довжини n; id вузла = його індекс.
+    """
+    idx = np.arange(n, dtype=np.int64)
+    depth = np.floor(np.log2(idx + 1)).astype(np.int64)
+    # log2 з плаваючою комою може помилитися на межі рівня — виправляємо
+    depth -= (1 << depth) > idx + 1
+    depth += (1 << (depth + 1)) <= idx + 1
+
+    max_depth = int(depth[-1]) if n else 0
+    pos_in_level = idx - ((1 << depth) - 1)
+    x = (pos_in_level + 0.5) * (1 << (max_depth - depth)).astype(float)
+    y = -depth.astype(float)
+    return x, y
+
+
+def heap_edges(x, y):
+    """Відрізки батько -> дитина для LineCollection: масив форми (n - 1, 2, 2)."""
+    child = np.arange(1, len(x))
+    parent = (child - 1) // 2
+    return np.stack([np.column_stack([x[parent], y[parent]]), np.column_stack([x[child], y[child]])], axis=1)
+
+
+def draw_heap(heap, title=None, color="skyblue"):
+    """
+    Малює купу без обʼєктів Node: одна LineCollection для всіх ребер
+    і один scatter для всіх вузлів (підписи — лише для невеликих куп).
+    color — один колір або послідовність кольорів для кожного вузла.
+    """
+    n = len(heap)
+    x, y = heap_layout(n)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    if title:
+        ax.set_title(title)
+    ax.add_collection(LineCollection(heap_edges(x, y), colors="gray", linewidths=0.5))
+    ax.scatter(x, y, s=max(1.0, min(900.0, 20000 / max(1, n))), c=color, zorder=2)
+
+    if n <= LABEL_LIMIT:
+        for i in range(n):
+            ax.annotate(str(heap[i]), (x[i], y[i]), ha="center", va="center", zorder=3)
+
+    ax.autoscale_view()
+    ax.set_axis_off()
+    plt.show()
+
+
+# --------- НЕЯВНЕ ДЕРЕВО ПОВЕРХ МАСИВУ ---------
+
+class HeapTreeView:
+    """
+    Бінарне дерево, яке вже неявно задане масивом-купою (0-індексація), без копіювання
+    та без обʼєктів Node: вузол — це індекс i, навігація — арифметика індексів.
+    heap — будь-яка послідовність з len() та індексацією: list, memoryview, масив NumPy.
+    Кольори зберігаються лише для перефарбованих вузлів, решта має колір за замовчуванням.
+    """
+
+    def __init__(self, heap, color="skyblue"):
+        self.heap = heap
+        self.default_color = color
+        self._colors = {}  # індекс -> колір (лише змінені)
+
+    def __len__(self):
+        return len(self.heap)
+
+    # ---------- НАВІГАЦІЯ ----------
+    def root(self):
+        return 0 if len(self.heap) else None
+
+    def value(self, i):
+        return self.heap[i]
+
+    def parent(self, i):
+        return (i - 1) // 2 if i > 0 else None
+
+    def left(self, i):
+        li = 2 * i + 1
+        return li if li < len(self.heap) else None
+
+    def right(self, i):
+        ri = 2 * i + 2
+        return ri if ri < len(self.heap) else None
+
+    @staticmethod
+    def depth(i):
+        return (i + 1).bit_length() - 1
+
+    def height(self):
+        return self.depth(len(self.heap) - 1) if len(self.heap) else -1
+
+    # ---------- КОЛЬОРИ ----------
+    def color(self, i):
+        return self._colors.get(i, self.default_color)
+
+    def set_color(self, i, color):
+        self._colors[i] = color
+
+    def reset_colors(self, color=None):
+        if color is not None:
+            self.default_color = color
+        self._colors.clear()
+
+    # ---------- ОБХОДИ (генератори індексів, без рекурсії) ----------
+    def levelorder(self):
+        # Масив купи вже записаний у порядку BFS
+        return iter(range(len(self.heap)))
+
+    def reverse_levelorder(self):
+        n = len(self.heap)
+        for d in range(self.height(), -1, -1):
+            yield from range((1 << d) - 1, min((1 << (d + 1)) - 1, n))
+
+    def preorder(self):
+        n = len(self.heap)
+        stack = [0] if n else []
+        while stack:
+            i = stack.pop()
+            yield i
+            if 2 * i + 2 < n:
+                stack.append(2 * i + 2)
+            if 2 * i + 1 < n:
+                stack.append(2 * i + 1)
+
+    def inorder(self):
+        n = len(self.heap)
+        stack = []
+        i = 0
+        while stack or i < n:
+            while i < n:
+                stack.append(i)
+                i = 2 * i + 1
+            i = stack.pop()
+            yield i
+            i = 2 * i + 2
+
+    def postorder(self):
+        n = len(self.heap)
+        stack = []
+        i = 0
+        last = -1
+        while stack or i < n:
+            while i < n:
+                stack.append(i)
+                i = 2 * i + 1
+            top = stack[-1]
+            ri = 2 * top + 2
+            if ri < n and ri != last:
+                i = ri
+            else:
+                stack.pop()
+                last = top
+                yield top
+                i = n  # не спускатися повторно
+
+    # ---------- МАЛЮВАННЯ ----------
+    def draw(self, title=None):
+        if self._colors:
+            colors = [self.color(i) for i in range(len(self.heap))]
+        else:
+            colors = self.default_color
+        draw_heap(self.heap, title=title, color=colors)
+
+
 def visualize_heap(heap, title="Binary Heap"):
     """
     Будує дерево з купи та візуалізує його.
+    Великі купи малюються напряму з масиву (draw_heap).
     """
+    if len(heap) > LABEL_LIMIT:
+        draw_heap(heap, title=title)
+        return
+
     root = heap_to_tree(heap)
     if root is None:
         print("Heap порожня — нема що візуалізувати.")
@@ -87,3 +266,11 @@ if __name__ == "__main__":
     # приклад мін-купи (як у heapq): найменший елемент в корені
     heap = [1, 3, 6, 5, 9, 8]
     visualize_heap(heap, title="Min-Heap visualization")
+
+    # той самий масив як неявне дерево: шлях від найглибшого вузла до кореня
+    view = HeapTreeView(heap)
+    i = len(view) - 1
+    while i is not None:
+        view.set_color(i, "orange")
+        i = view.parent(i)
+    view.draw(title="Min-Heap: шлях від останнього вузла до кореня")
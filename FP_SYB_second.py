@@ -1,94 +1,236 @@
 # Дерево Піфагора
-import turtle
+import argparse
 import math
+import struct
+import turtle
+import zlib
+
+import numpy as np
+
+# Початкові параметри (світові координати вікна turtle 1000 x 800)
+WORLD_WIDTH = 1000
+WORLD_HEIGHT = 800
+START_SIDE = 140
+START_X = -START_SIDE / 2
+START_Y = -300
+START_ANGLE = 0  # квадрат стоїть горизонтально
+
+# Усе піддерево квадрата зі стороною s лежить у крузі радіуса SUBTREE_REACH * s
+# навколо його центру: s * sqrt(2) / 2 + s / (1 - 1 / sqrt(2)) < 4.2 * s
+SUBTREE_REACH = 4.2
+
+
+def iter_tree_levels(x: float, y: float, angle: float, side: float, level: int,
+                     min_side: float = 1, viewport=None):
+    """
+    Обчислює геометрію "Дерева Піфагора" без рекурсії та без turtle — рівень за рівнем.
+    Кожен рівень — афінне перетворення попереднього, тому рахується векторно (NumPy).
+    Повертає (генератор) масиви кутів квадратів форми (k, 4, 2) для кожного рівня:
+    нижній лівий, нижній правий, верхній правий, верхній лівий.
+    Квадрати зі стороною side < min_side відкидаються (і не породжують дітей).
+    viewport = (xmin, ymin, xmax, ymax): відкидаються квадрати, чиє піддерево
+    цілком поза цією областю.
+    """
+    xs = np.array([x], dtype=float)
+    ys = np.array([y], dtype=float)
+    angles = np.array([math.radians(angle)])
+    sides = np.array([side], dtype=float)
+
+    for _ in range(level):
+        keep = sides >= min_side
+        if viewport is not None:
+            keep &= _subtree_visible(xs, ys, angles, sides, viewport)
+        if not keep.all():
+            xs, ys, angles, sides = xs[keep], ys[keep], angles[keep], sides[keep]
+        if xs.size == 0:
+            return
+
+        # Вектор "вправо" (вздовж нижньої сторони) та "вгору" (перпендикуляр), помножені на side
+        ux, uy = np.cos(angles) * sides, np.sin(angles) * sides
+        vx, vy = -uy, ux
+
+        corners = np.empty((xs.size, 4, 2))
+        corners[:, 0, 0], corners[:, 0, 1] = xs, ys
+        corners[:, 1, 0], corners[:, 1, 1] = xs + ux, ys + uy
+        corners[:, 2, 0], corners[:, 2, 1] = xs + ux + vx, ys + uy + vy
+        corners[:, 3, 0], corners[:, 3, 1] = xs + vx, ys + vy
+        yield corners
+
+        # Діти: лівий росте з верхнього лівого кута під кутом angle + 45,
+        # правий — з верхнього правого під кутом angle - 45; сторона / sqrt(2)
+        xs = np.concatenate([corners[:, 3, 0], corners[:, 2, 0]])
+        ys = np.concatenate([corners[:, 3, 1], corners[:, 2, 1]])
+        angles = np.concatenate([angles + math.pi / 4, angles - math.pi / 4])
+        sides = np.concatenate([sides, sides]) / math.sqrt(2)
+
+
+def _subtree_visible(xs, ys, angles, sides, viewport) -> np.ndarray:
+    """Чи може піддерево кожного квадрата перетинати viewport (консервативна перевірка)."""
+    xmin, ymin, xmax, ymax = viewport
+    half = sides / 2
+    cx = xs + half * (np.cos(angles) - np.sin(angles))
+    cy = ys + half * (np.sin(angles) + np.cos(angles))
+    reach = SUBTREE_REACH * sides
+    return (cx + reach >= xmin) & (cx - reach <= xmax) & (cy + reach >= ymin) & (cy - reach <= ymax)
+
+
+def pythagoras_tree_geometry(x: float, y: float, angle: float, side: float, level: int) -> np.ndarray:
+    """Усі квадрати дерева одним масивом форми (N, 4, 2)."""
+    levels = list(iter_tree_levels(x, y, angle, side, level))
+    if not levels:
+        return np.empty((0, 4, 2))
+    return np.concatenate(levels)
+
+
+def draw_polygons(t: turtle.Turtle, polygons: np.ndarray):
+    """Малює готові многокутники (масив (N, k, 2)) черепашкою."""
+    for poly in polygons.tolist():
+        t.penup()
+        t.goto(*poly[0])
+        t.pendown()
+        for px, py in poly[1:]:
+            t.goto(px, py)
+        t.goto(*poly[0])
 
 
 def pythagoras_tree(t: turtle.Turtle, x: float, y: float, angle: float, side: float, level: int):
     """
-    Малює "Дерево Піфагора" рекурсивно.
+    Малює "Дерево Піфагора".
     Кожен крок: квадрат + 2 квадрати-діти під кутами 45° і 45° (класична версія).
+    Геометрія рахується заздалегідь (iter_tree_levels), turtle лише малює.
     """
-    if level == 0 or side < 1:
-        return
+    for corners in iter_tree_levels(x, y, angle, side, level):
+        draw_polygons(t, corners)
 
-    # Перейти в точку (x, y), встановити кут
-    t.penup()
-    t.goto(x, y)
-    t.setheading(angle)
-    t.pendown()
-
-    # Намалювати квадрат зі стороною side
-    for _ in range(4):
-        t.forward(side)
-        t.left(90)
-
-    # Обчислення ключових точок
-    # Стартова точка (x,y) — нижній лівий кут квадрата (за напрямом angle)
-    # Після квадрату нам потрібні координати верхніх кутів.
-    # Вектор "вправо" (вздовж нижньої сторони) та "вгору" (перпендикуляр)
-    rad = math.radians(angle)
-    ux, uy = math.cos(rad), math.sin(rad)              # одиничний вектор вправо
-    vx, vy = -math.sin(rad), math.cos(rad)             # одиничний вектор вгору
-
-    # Верхній лівий кут (x + v*side)
-    top_left = (x + vx * side, y + vy * side)
-    # Верхній правий кут (x + u*side + v*side)
-    top_right = (x + ux * side + vx * side, y + uy * side + vy * side)
-
-    # Довжина сторін дочірніх квадратів для кута 45°:
-    child_side = side / math.sqrt(2)
-
-    # Лівий дочірній квадрат "росте" з top_left під кутом angle + 45
-    pythagoras_tree(
-        t,
-        x=top_left[0],
-        y=top_left[1],
-        angle=angle + 45,
-        side=child_side,
-        level=level - 1
-    )
-
-    # Правий дочірній квадрат "росте" з точки, яка лежить на "дахові":
-    # У класичній побудові правий квадрат стартує не з top_right, а з вершини трикутника.
-    # Але для простої/красивої версії часто використовують старт з top_right.
-    # Це дає симпатичне дерево та чітку рекурсію.
-    pythagoras_tree(
-        t,
-        x=top_right[0],
-        y=top_right[1],
-        angle=angle - 45,
-        side=child_side,
-        level=level - 1
-    )
 
+# ---------- РЕНДЕР БЕЗ ДИСПЛЕЯ (PNG / SVG) ----------
 
-def main():
+def _pixel_levels(level: int, width: int, height: int):
+    """
+    Рівні дерева у піксельних координатах зображення width x height
+    (вікно turtle масштабується, щоб уміститися, вісь y направлена вниз).
+    Відкидаються піддерева, менші за піксель або поза кадром.
+    """
+    scale = min(width / WORLD_WIDTH, height / WORLD_HEIGHT)
+    half_w, half_h = width / 2 / scale, height / 2 / scale
+    viewport = (-half_w, -half_h, half_w, half_h)
+
+    for corners in iter_tree_levels(START_X, START_Y, START_ANGLE, START_SIDE, level,
+                                    min_side=max(1, 1 / scale), viewport=viewport):
+        pixels = np.empty_like(corners)
+        pixels[..., 0] = width / 2 + corners[..., 0] * scale
+        pixels[..., 1] = height / 2 - corners[..., 1] * scale
+        yield pixels
+
+
+def _draw_outlines(buf: np.ndarray, squares: np.ndarray, max_points: int = 1 << 22):
+    """Растеризує контури квадратів (k, 4, 2) у буфер: точки вздовж кожного ребра з кроком <= 1 px."""
+    height, width = buf.shape
+    starts = squares
+    ends = np.roll(squares, -1, axis=1)
+    n_samples = int(np.ceil(np.abs(ends - starts).max(initial=0))) + 1
+    t = np.linspace(0.0, 1.0, n_samples)[:, None]
+
+    # Порціями, щоб проміжний масив точок не ріс необмежено
+    step = max(1, max_points // (4 * n_samples))
+    for lo in range(0, len(squares), step):
+        a = starts[lo:lo + step, :, None, :]
+        d = ends[lo:lo + step, :, None, :] - a
+        pts = np.rint(a + d * t).astype(np.int64).reshape(-1, 2)
+        inside = (pts[:, 0] >= 0) & (pts[:, 0] < width) & (pts[:, 1] >= 0) & (pts[:, 1] < height)
+        pts = pts[inside]
+        buf[pts[:, 1], pts[:, 0]] = 0
+
+
+def _write_png(path: str, buf: np.ndarray):
+    """Записує 8-бітне сіре зображення у PNG (лише stdlib: zlib + struct)."""
+    height, width = buf.shape
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    raw = np.zeros((height, width + 1), dtype=np.uint8)  # фільтр 0 на початку кожного рядка
+    raw[:, 1:] = buf
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def render_png(path: str, level: int, width: int = WORLD_WIDTH, height: int = WORLD_HEIGHT):
+    """Малює дерево у PNG без дисплея (буфер NumPy)."""
+    buf = np.full((height, width), 255, dtype=np.uint8)
+    for squares in _pixel_levels(level, width, height):
+        _draw_outlines(buf, squares)
+    _write_png(path, buf)
+
+
+def render_svg(path: str, level: int, width: int = WORLD_WIDTH, height: int = WORLD_HEIGHT):
+    """Записує дерево у SVG потоково — рівень за рівнем, не тримаючи весь документ у памʼяті."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                f'viewBox="0 0 {width} {height}">\n')
+        f.write('<rect width="100%" height="100%" fill="white"/>\n')
+        f.write('<g fill="none" stroke="black" stroke-width="1">\n')
+        for squares in _pixel_levels(level, width, height):
+            lines = [
+                '<path d="M{:.2f} {:.2f}L{:.2f} {:.2f}L{:.2f} {:.2f}L{:.2f} {:.2f}Z"/>\n'.format(*sq)
+                for sq in squares.reshape(-1, 8).tolist()
+            ]
+            f.write("".join(lines))
+        f.write("</g>\n</svg>\n")
+
+
+def parse_size(value: str):
     try:
-        level = int(input("Введіть рівень рекурсії (наприклад 1..12): ").strip())
+        width, height = (int(v) for v in value.lower().split("x"))
     except ValueError:
-        print("Потрібно ввести ціле число.")
-        return
+        raise argparse.ArgumentTypeError("Розмір має бути у форматі ШИРИНАxВИСОТА, напр. 1000x800.")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError("Ширина і висота мають бути > 0.")
+    return width, height
+
 
-    if level < 0:
-        print("Рівень рекурсії має бути >= 0.")
+def parse_args():
+    parser = argparse.ArgumentParser(description="Фрактал: Дерево Піфагора")
+    parser.add_argument("level", type=int, help="рівень рекурсії (наприклад 1..12)")
+    parser.add_argument("--size", type=parse_size, default=(WORLD_WIDTH, WORLD_HEIGHT),
+                        help="розмір зображення/вікна ШИРИНАxВИСОТА (за замовчуванням 1000x800)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="файл .png або .svg; без нього дерево малюється у вікні turtle")
+    args = parser.parse_args()
+
+    if args.level < 0:
+        parser.error("Рівень рекурсії має бути >= 0.")
+    if args.output and not args.output.lower().endswith((".png", ".svg")):
+        parser.error("Підтримуються лише файли .png та .svg.")
+    return args
+
+
+def main():
+    args = parse_args()
+    level = args.level
+    width, height = args.size
+
+    if args.output:
+        if args.output.lower().endswith(".svg"):
+            render_svg(args.output, level, width, height)
+        else:
+            render_png(args.output, level, width, height)
+        print(f"Збережено: {args.output}")
         return
 
     screen = turtle.Screen()
     screen.title("Фрактал: Дерево Піфагора (рекурсія)")
-    screen.setup(width=1000, height=800)
+    screen.setup(width=width, height=height)
     screen.tracer(0)  # прискорення (малюємо без анімації)
 
     t = turtle.Turtle(visible=False)
     t.speed(0)
     t.pensize(1)
 
-    # Початкові параметри
-    start_side = 140
-    start_x = -start_side / 2
-    start_y = -300
-    start_angle = 0  # квадрат стоїть горизонтально
-
-    pythagoras_tree(t, start_x, start_y, start_angle, start_side, level)
+    pythagoras_tree(t, START_X, START_Y, START_ANGLE, START_SIDE, level)
 
     screen.update()
     screen.mainloop()
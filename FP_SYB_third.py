@@ -1,21 +1,138 @@
-# Реалізація алгоритму Дейкстри для зваженого графа з використанням бінарноїь купи heapq
+# Реалізація алгоритму Дейкстри для зваженого графа з використанням бінарної купи heapq
 import heapq
+import os
+from array import array
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from math import inf
 
 
-def dijkstra(graph: dict, start):
+class IndexedMinHeap:
+    """
+    Бінарна мін-купа з індексом позицій елементів.
+    push / pop / decrease_key — за O(log n); кожен елемент у купі лише один раз.
+    """
+
+    def __init__(self):
+        self._items = []  # елементи (вершини) у порядку купи
+        self._keys = []   # їхні пріоритети (відстані)
+        self._pos = {}    # елемент -> позиція в _items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def key_of(self, item):
+        return self._keys[self._pos[item]]
+
+    def peek(self):
+        """Повертає (елемент, пріоритет) з найменшим пріоритетом, не видаляючи його."""
+        if not self._items:
+            raise IndexError("peek from empty heap")
+        return self._items[0], self._keys[0]
+
+    def push(self, item, key):
+        if item in self._pos:
+            raise KeyError(f"{item!r} вже є в купі")
+        self._items.append(item)
+        self._keys.append(key)
+        self._pos[item] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+
+    def pop(self):
+        """Видаляє та повертає (елемент, пріоритет) з найменшим пріоритетом."""
+        if not self._items:
+            raise IndexError("pop from empty heap")
+
+        item, key = self._items[0], self._keys[0]
+        last_item = self._items.pop()
+        last_key = self._keys.pop()
+        del self._pos[item]
+
+        if self._items:
+            self._items[0] = last_item
+            self._keys[0] = last_key
+            self._pos[last_item] = 0
+            self._sift_down(0)
+        return item, key
+
+    def decrease_key(self, item, key):
+        i = self._pos[item]
+        if key > self._keys[i]:
+            raise ValueError("Новий пріоритет більший за поточний.")
+        self._keys[i] = key
+        self._sift_up(i)
+
+    def push_or_decrease(self, item, key):
+        """Додає елемент або зменшує його пріоритет, якщо він уже в купі."""
+        if item in self._pos:
+            self.decrease_key(item, key)
+        else:
+            self.push(item, key)
+
+    def _sift_up(self, i):
+        items, keys, pos = self._items, self._keys, self._pos
+        item, key = items[i], keys[i]
+        while i > 0:
+            parent = (i - 1) // 2
+            if keys[parent] <= key:
+                break
+            items[i], keys[i] = items[parent], keys[parent]
+            pos[items[i]] = i
+            i = parent
+        items[i], keys[i] = item, key
+        pos[item] = i
+
+    def _sift_down(self, i):
+        items, keys, pos = self._items, self._keys, self._pos
+        n = len(items)
+        item, key = items[i], keys[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and keys[child + 1] < keys[child]:
+                child += 1
+            if key <= keys[child]:
+                break
+            items[i], keys[i] = items[child], keys[child]
+            pos[items[i]] = i
+            i = child
+        items[i], keys[i] = item, key
+        pos[item] = i
+
+
+def dijkstra(graph: dict, start, target=None, targets=None, indexed=False):
     """
     graph: dict[vertex] -> list[(neighbor, weight)]
     start: стартова вершина
+    target: (опційно) зупинитися, щойно ця вершина буде остаточно опрацьована
+    targets: (опційно) зупинитися, щойно будуть опрацьовані всі ці вершини
+    indexed: використати IndexedMinHeap (decrease-key, купа не більша за кількість вершин)
+             замість heapq; повільніше, але економить памʼять на дуже щільних графах
 
     Повертає:
       dist: dict[vertex] -> найкоротша відстань від start
       prev: dict[vertex] -> попередник у найкоротшому шляху (для відновлення маршруту)
+
+    При ранній зупинці dist/prev остаточні для target(s) та всіх вершин,
+    опрацьованих раніше; для решти — проміжні (або inf/None).
     """
     dist = {v: inf for v in graph}
     prev = {v: None for v in graph}
 
+    stop_early = target is not None or targets is not None
+    pending = set(targets) if targets is not None else set()
+    if target is not None:
+        pending.add(target)
+
     dist[start] = 0
+    if indexed:
+        _dijkstra_indexed(graph, start, dist, prev, pending if stop_early else None)
+        return dist, prev
+
     heap = [(0, start)]  # (distance, vertex)
 
     while heap:
@@ -25,6 +142,12 @@ def dijkstra(graph: dict, start):
         if current_dist != dist[u]:
             continue
 
+        # Перше актуальне вилучення вершини — вона остаточно опрацьована
+        if stop_early:
+            pending.discard(u)
+            if not pending:
+                break
+
         for v, w in graph[u]:
             if w < 0:
                 raise ValueError("Алгоритм Дейкстри не працює з від'ємними вагами ребер.")
@@ -38,6 +161,30 @@ def dijkstra(graph: dict, start):
     return dist, prev
 
 
+def _dijkstra_indexed(graph: dict, start, dist: dict, prev: dict, pending):
+    """Варіант dijkstra на IndexedMinHeap; pending=None — без ранньої зупинки."""
+    heap = IndexedMinHeap()
+    heap.push(start, 0)
+
+    while heap:
+        u, current_dist = heap.pop()
+
+        if pending is not None:
+            pending.discard(u)
+            if not pending:
+                break
+
+        for v, w in graph[u]:
+            if w < 0:
+                raise ValueError("Алгоритм Дейкстри не працює з від'ємними вагами ребер.")
+
+            new_dist = current_dist + w
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                prev[v] = u
+                heap.push_or_decrease(v, new_dist)
+
+
 def reconstruct_path(prev: dict, start, target):
     """Відновлює шлях start -> target за масивом prev. Повертає список вершин."""
     if start == target:
@@ -55,6 +202,397 @@ def reconstruct_path(prev: dict, start, target):
     return []  # якщо target недосяжна
 
 
+# ---------- ПОШУК ШЛЯХУ МІЖ ДВОМА ВЕРШИНАМИ ----------
+def reverse_graph(graph: dict) -> dict:
+    """Граф з розвернутими ребрами (для пошуку від target назад)."""
+    rev = {v: [] for v in graph}
+    for u, edges in graph.items():
+        for v, w in edges:
+            rev.setdefault(v, []).append((u, w))
+    return rev
+
+
+def bidirectional_dijkstra(graph: dict, start, target, rev_graph=None):
+    """
+    Двонапрямлена Дейкстра: пошук одночасно від start і від target (по розвернутих ребрах).
+    rev_graph — (опційно) готовий reverse_graph(graph) для повторних запитів.
+
+    Повертає (dist, path): довжину найкоротшого шляху та список вершин
+    (inf і [], якщо target недосяжна).
+    """
+    if start == target:
+        return 0, [start]
+    if rev_graph is None:
+        rev_graph = reverse_graph(graph)
+
+    # Індекс 0 — прямий пошук, 1 — зворотний
+    adj = (graph, rev_graph)
+    dist = ({start: 0}, {target: 0})
+    prev = ({start: None}, {target: None})
+    heaps = (IndexedMinHeap(), IndexedMinHeap())
+    heaps[0].push(start, 0)
+    heaps[1].push(target, 0)
+
+    best = inf
+    meet = None
+
+    while heaps[0] and heaps[1]:
+        # Зупинка: жоден шлях через ще не опрацьовані вершини не буде коротшим
+        if heaps[0].peek()[1] + heaps[1].peek()[1] >= best:
+            break
+
+        # Розширюємо менший фронт
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        other = 1 - side
+        u, current_dist = heaps[side].pop()
+
+        for v, w in adj[side].get(u, ()):
+            if w < 0:
+                raise ValueError("Алгоритм Дейкстри не працює з від'ємними вагами ребер.")
+
+            new_dist = current_dist + w
+            if new_dist < dist[side].get(v, inf):
+                dist[side][v] = new_dist
+                prev[side][v] = u
+                heaps[side].push_or_decrease(v, new_dist)
+
+            if v in dist[other] and new_dist + dist[other][v] < best:
+                best = new_dist + dist[other][v]
+                meet = v
+
+    if meet is None:
+        return inf, []
+
+    # start -> meet за прямими попередниками, далі meet -> target за зворотними
+    path = []
+    cur = meet
+    while cur is not None:
+        path.append(cur)
+        cur = prev[0][cur]
+    path.reverse()
+
+    cur = prev[1][meet]
+    while cur is not None:
+        path.append(cur)
+        cur = prev[1][cur]
+
+    return best, path
+
+
+def astar(graph: dict, start, target, heuristic=None):
+    """
+    A*: Дейкстра, у якій вершини впорядковуються за dist + heuristic(v, target).
+    heuristic має бути допустимою (не переоцінювати відстань до target);
+    без неї пошук збігається зі звичайною Дейкстрою з ранньою зупинкою.
+
+    Повертає (dist, path), як bidirectional_dijkstra.
+    """
+    if heuristic is None:
+        def heuristic(_v, _target):
+            return 0
+
+    dist = {start: 0}
+    prev = {start: None}
+    heap = IndexedMinHeap()
+    heap.push(start, heuristic(start, target))
+
+    while heap:
+        u, _ = heap.pop()
+        if u == target:
+            path = []
+            cur = u
+            while cur is not None:
+                path.append(cur)
+                cur = prev[cur]
+            path.reverse()
+            return dist[u], path
+
+        current_dist = dist[u]
+        for v, w in graph[u]:
+            if w < 0:
+                raise ValueError("Алгоритм Дейкстри не працює з від'ємними вагами ребер.")
+
+            new_dist = current_dist + w
+            if new_dist < dist.get(v, inf):
+                dist[v] = new_dist
+                prev[v] = u
+                # Для неконсистентної евристики вершина може повернутися в купу
+                heap.push_or_decrease(v, new_dist + heuristic(v, target))
+
+    return inf, []
+
+
+# ---------- КЕШ НАЙКОРОТШИХ ШЛЯХІВ ----------
+class ShortestPathCache:
+    """
+    Кеш результатів dijkstra (dist, prev) для окремих джерел з LRU-витісненням.
+    Граф змінюється лише через add_edge / remove_edge / set_weight:
+    зменшення ваги (чи нове ребро) виправляє кешовані результати на місці,
+    а збільшення ваги чи видалення ребра скидає лише ті джерела,
+    у дереві найкоротших шляхів яких було це ребро.
+    """
+
+    def __init__(self, graph: dict, max_sources=128):
+        self.graph = graph
+        self.max_sources = max_sources
+        self._cache = OrderedDict()  # source -> (dist, prev)
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- ЗАПИТИ ----------
+    def get(self, source):
+        """Повертає (dist, prev) для source. Результати спільні з кешем — не змінюйте їх."""
+        if source in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(source)
+            return self._cache[source]
+
+        self.misses += 1
+        result = dijkstra(self.graph, source)
+        self._cache[source] = result
+        if len(self._cache) > self.max_sources:
+            self._cache.popitem(last=False)
+        return result
+
+    def shortest_path(self, source, target):
+        """Повертає (dist, path) для пари вершин."""
+        dist, prev = self.get(source)
+        return dist[target], reconstruct_path(prev, source, target)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self._cache)}
+
+    def invalidate(self, source=None):
+        """Скидає кеш для source або повністю."""
+        if source is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(source, None)
+
+    # ---------- ЗМІНИ ГРАФА ----------
+    def add_edge(self, u, v, w):
+        if w < 0:
+            raise ValueError("Алгоритм Дейкстри не працює з від'ємними вагами ребер.")
+        self._ensure_vertex(u)
+        self._ensure_vertex(v)
+        self.graph[u].append((v, w))
+        self._on_decrease(u, v, w)
+
+    def remove_edge(self, u, v):
+        """Видаляє всі ребра u -> v."""
+        edges = self.graph[u]
+        kept = [(x, w) for x, w in edges if x != v]
+        if len(kept) == len(edges):
+            raise KeyError(f"Ребра {u!r} -> {v!r} немає.")
+        self.graph[u] = kept
+        self._on_increase(u, v)
+
+    def set_weight(self, u, v, w):
+        """Замінює ребро (ребра) u -> v одним ребром ваги w."""
+        if w < 0:
+            raise ValueError("Алгоритм Дейкстри не працює з від'ємними вагами ребер.")
+        old = [x_w for x, x_w in self.graph[u] if x == v]
+        if not old:
+            raise KeyError(f"Ребра {u!r} -> {v!r} немає.")
+
+        self.graph[u] = [(x, x_w) for x, x_w in self.graph[u] if x != v]
+        self.graph[u].append((v, w))
+
+        if w < min(old):
+            self._on_decrease(u, v, w)
+        elif w > min(old):
+            self._on_increase(u, v)
+
+    def _ensure_vertex(self, x):
+        if x not in self.graph:
+            self.graph[x] = []
+            for dist, prev in self._cache.values():
+                dist[x] = inf
+                prev[x] = None
+
+    def _on_increase(self, u, v):
+        # Відстані змінюються лише там, де u -> v входило в дерево шляхів
+        stale = [s for s, (_, prev) in self._cache.items() if prev[v] == u]
+        for source in stale:
+            del self._cache[source]
+
+    def _on_decrease(self, u, v, w):
+        # Ребро стало коротшим: поширюємо покращення від v, як у Дейкстрі
+        for dist, prev in self._cache.values():
+            new_dist = dist[u] + w
+            if new_dist >= dist[v]:
+                continue
+
+            dist[v] = new_dist
+            prev[v] = u
+            heap = IndexedMinHeap()
+            heap.push(v, new_dist)
+            while heap:
+                x, x_dist = heap.pop()
+                for y, y_w in self.graph[x]:
+                    if x_dist + y_w < dist[y]:
+                        dist[y] = x_dist + y_w
+                        prev[y] = x
+                        heap.push_or_decrease(y, dist[y])
+
+
+# ---------- КОМПАКТНИЙ ГРАФ (CSR) ----------
+class CSRGraph:
+    """
+    Граф у форматі compressed sparse row:
+      сусіди вершини i — targets[offsets[i]:offsets[i + 1]],
+      ваги відповідних ребер — weights[offsets[i]:offsets[i + 1]].
+    Вершини мають цілі id 0..n-1; labels[id] -> мітка, index[мітка] -> id.
+    """
+
+    def __init__(self, offsets, targets, weights, labels):
+        self.offsets = offsets  # array("q"), довжина n + 1
+        self.targets = targets  # array("q"), довжина m
+        self.weights = weights  # array("d"), довжина m
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def neighbors(self, i):
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+
+def to_csr(graph: dict) -> CSRGraph:
+    """Перетворює список суміжності dict[vertex] -> list[(neighbor, weight)] у CSRGraph."""
+    labels = list(graph)
+    index = {label: i for i, label in enumerate(labels)}
+
+    offsets = array("q", [0])
+    targets = array("q")
+    weights = array("d")
+
+    for u in graph:
+        for v, w in graph[u]:
+            if w < 0:
+                raise ValueError("Алгоритм Дейкстри не працює з від'ємними вагами ребер.")
+            if v not in index:
+                index[v] = len(labels)
+                labels.append(v)
+            targets.append(index[v])
+            weights.append(w)
+        offsets.append(len(targets))
+
+    # Вершини, що трапляються лише як сусіди, не мають вихідних ребер
+    offsets.extend([len(targets)] * (len(labels) + 1 - len(offsets)))
+    return CSRGraph(offsets, targets, weights, labels)
+
+
+def dijkstra_csr(csr: CSRGraph, start, target=None):
+    """
+    Дейкстра на CSRGraph. start і target — мітки вершин.
+
+    Повертає:
+      dist: array("d") — dist[id] найкоротша відстань (inf, якщо недосяжна)
+      prev: array("q") — prev[id] id попередника (-1, якщо немає)
+    """
+    n = len(csr)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    dist = array("d", [inf]) * n
+    prev = array("q", [-1]) * n
+
+    s = csr.index[start]
+    t = csr.index[target] if target is not None else -1
+
+    dist[s] = 0
+    heap = [(0.0, s)]  # (distance, id)
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    while heap:
+        current_dist, u = heappop(heap)
+
+        # Застарілий запис у купі — пропускаємо
+        if current_dist > dist[u]:
+            continue
+        if u == t:
+            break
+
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_dist = current_dist + weights[e]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                prev[v] = u
+                heappush(heap, (new_dist, v))
+
+    return dist, prev
+
+
+def reconstruct_path_csr(csr: CSRGraph, prev, start, target):
+    """Відновлює шлях start -> target (мітки) за масивом prev з dijkstra_csr."""
+    s = csr.index[start]
+    cur = csr.index[target]
+
+    path = []
+    while cur != -1:
+        path.append(cur)
+        if cur == s:
+            break
+        cur = prev[cur]
+    path.reverse()
+
+    if path and path[0] == s:
+        return [csr.labels[i] for i in path]
+    return []  # якщо target недосяжна
+
+
+# ---------- ВСІ ПАРИ / БАГАТО ДЖЕРЕЛ ----------
+_WORKER_CSR = None  # CSR-граф, переданий у процес-воркер один раз
+
+
+def _init_worker(csr):
+    global _WORKER_CSR
+    _WORKER_CSR = csr
+
+
+def _worker_dijkstra(source):
+    dist, _ = dijkstra_csr(_WORKER_CSR, source)
+    return source, dist
+
+
+def all_pairs_dijkstra(graph, sources=None, workers=None):
+    """
+    Найкоротші відстані від кожного джерела з sources (за замовчуванням — від усіх вершин).
+    graph — dict списку суміжності або готовий CSRGraph.
+    workers — кількість процесів (за замовчуванням os.cpu_count(); 1 — без пулу).
+
+    Генератор: по одному повертає (source, dist), де dist — array("d")
+    у порядку to_csr(graph).labels. Порядок джерел — за готовністю.
+    Граф передається кожному воркеру один раз у компактному CSR-вигляді,
+    а в роботі одночасно лише кілька задач на воркер, тож уся матриця
+    відстаней ніколи не зберігається в памʼяті.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else to_csr(graph)
+    sources = csr.labels if sources is None else sources
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for source in sources:
+            dist, _ = dijkstra_csr(csr, source)
+            yield source, dist
+        return
+
+    max_in_flight = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(csr,)) as pool:
+        pending = set()
+        for source in sources:
+            pending.add(pool.submit(_worker_dijkstra, source))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in as_completed(pending):
+            yield future.result()
+
+
 if __name__ == "__main__":
     # 1) Створюємо зважений граф (список суміжності)
     # Формат: вершина: [(сусід, вага), ...]
@@ -87,3 +625,37 @@ if __name__ == "__main__":
         print(f"\nШлях {start_vertex} -> {target}: {' -> '.join(path)} (довжина = {dist[target]})")
     else:
         print(f"\nШлях {start_vertex} -> {target}: недосяжно")
+
+    # 5) Запит до однієї вершини: пошук зупиняється, щойно target опрацьована
+    t_dist, t_prev = dijkstra(graph, start_vertex, target=target)
+    t_path = reconstruct_path(t_prev, start_vertex, target)
+    print(f"Ранній вихід, шлях {start_vertex} -> {target}: {' -> '.join(t_path)} (довжина = {t_dist[target]})")
+
+    # 6) Кеш для повторних запитів від тих самих джерел
+    cache = ShortestPathCache({u: list(edges) for u, edges in graph.items()})
+    cache.shortest_path(start_vertex, target)
+    cache.set_weight("C", "E", 1)
+    cache.set_weight("E", "C", 1)
+    k_dist, k_path = cache.shortest_path(start_vertex, target)
+    print(f"Після зміни ваги C-E, шлях {start_vertex} -> {target}: {' -> '.join(k_path)} (довжина = {k_dist})")
+    print("Статистика кешу:", cache.stats())
+
+    # 7) Двонапрямлений пошук та A* (без евристики) дають той самий результат
+    b_dist, b_path = bidirectional_dijkstra(graph, start_vertex, target)
+    print(f"Двонапрямлена Дейкстра, шлях {start_vertex} -> {target}: {' -> '.join(b_path)} (довжина = {b_dist})")
+    a_dist, a_path = astar(graph, start_vertex, target)
+    print(f"A*, шлях {start_vertex} -> {target}: {' -> '.join(a_path)} (довжина = {a_dist})")
+
+    # 8) Той самий запит на компактному CSR-представленні
+    csr = to_csr(graph)
+    c_dist, c_prev = dijkstra_csr(csr, start_vertex, target=target)
+    c_path = reconstruct_path_csr(csr, c_prev, start_vertex, target)
+    print(f"CSR, шлях {start_vertex} -> {target}: {' -> '.join(c_path)} (довжина = {c_dist[csr.index[target]]:g})")
+
+    # 9) Відстані від усіх вершин (паралельно, по рядку на джерело)
+    print("\nМатриця відстаней:")
+    labels = csr.labels
+    rows = dict(all_pairs_dijkstra(csr, workers=2))
+    print("     " + " ".join(f"{v:>4}" for v in labels))
+    for u in labels:
+        print(f"  {u}: " + " ".join(f"{d:>4g}" for d in rows[u]))